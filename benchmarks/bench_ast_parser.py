@@ -0,0 +1,113 @@
+"""Copyright (c) 2023 Aydin Abdi.
+
+Benchmark the parser backends of :class: `AsyncASTParser`.
+
+A synthetic set of test modules is created in a temporary directory and parsed
+with the ``async`` backend and with the ``process`` backend for an increasing
+number of worker processes. For each run the wall time, the files per second
+and the speedup over the ``async`` backend are reported.
+
+Example:
+    .. code-block:: console
+
+        $ PYTHONPATH=src python benchmarks/bench_ast_parser.py --workers 1 2 4 8
+
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from ats_linter.async_ast_parser import AsyncASTParser, ParserBackend
+
+TEST_CASE_TEMPLATE = '''
+    def test_case_{index}(self, fixture):
+        """Test case {index}.
+
+        Objective:
+            Check case {index}.
+
+        Test steps:
+            1. Run case {index}.
+
+        """
+        values = [value * {index} for value in range(10)]
+        assert sum(values) >= 0
+'''
+
+
+def create_modules(root: Path, nbr_of_files: int, tests_per_file: int) -> list[Path]:
+    """Create synthetic test modules.
+
+    Args:
+        root: The directory to create the modules in.
+        nbr_of_files: The number of modules to create.
+        tests_per_file: The number of test cases per module.
+
+    Returns:
+        The paths of the created modules.
+
+    """
+    body = "".join(
+        TEST_CASE_TEMPLATE.format(index=index) for index in range(tests_per_file)
+    )
+    paths = []
+    for index in range(nbr_of_files):
+        path = root / f"test_module_{index}.py"
+        path.write_text(f"import pytest\n\n\nclass TestModule{index}:{body}")
+        paths.append(path)
+    return paths
+
+
+def measure(paths: list[Path], backend: ParserBackend, max_workers: int) -> float:
+    """Measure the wall time of parsing all modules with a backend.
+
+    Args:
+        paths: The paths of the modules.
+        backend: The backend to parse with.
+        max_workers: The number of worker processes of the ``process`` backend.
+
+    Returns:
+        The wall time in seconds.
+
+    """
+    start = time.perf_counter()
+    parser = AsyncASTParser(paths, backend=backend, max_workers=max_workers)
+    elapsed = time.perf_counter() - start
+    assert len(parser.test_modules) == len(paths)
+    return elapsed
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--tests", type=int, default=20)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    args = parser.parse_args()
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = create_modules(Path(tmp), args.files, args.tests)
+        baseline = measure(paths, ParserBackend.ASYNC, 1)
+        print(f"{'async':>10}: {baseline:7.2f} s, {len(paths) / baseline:8.0f} files/s")
+        for max_workers in args.workers:
+            elapsed = measure(paths, ParserBackend.PROCESS, max_workers)
+            print(
+                f"{'process':>7} {max_workers:2d}: {elapsed:7.2f} s, "
+                f"{len(paths) / elapsed:8.0f} files/s, "
+                f"{baseline / elapsed:5.2f}x",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Copyright (c) 2023 Aydin Abdi.
+
+Benchmark the file collection engines of :class: `FileCollector`.
+
+A synthetic tree is created in a temporary directory and collected with the
+glob based engine, with the :func:`os.scandir` walker and with the walker
+reusing a warm :class: `DirectorySnapshot`. For each engine the wall time and
+the number of directory listings (``os.scandir`` and ``os.listdir`` calls,
+one ``getdents`` sequence each) are reported.
+
+Example:
+    .. code-block:: console
+
+        $ PYTHONPATH=src python benchmarks/bench_file_collector.py --width 8 --depth 4
+
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from unittest import mock
+
+from ats_linter.directory_snapshot import SNAPSHOT_FILE_NAME
+from ats_linter.file_collector import FileCollector
+
+
+def create_tree(root: Path, width: int, depth: int, files_per_directory: int) -> int:
+    """Create a synthetic tree of test and non-test directories.
+
+    Args:
+        root: The root directory of the tree.
+        width: The number of subdirectories per directory.
+        depth: The depth of the tree.
+        files_per_directory: The number of files per directory.
+
+    Returns:
+        The number of directories created, including the root.
+
+    """
+    nbr_of_directories = 1
+    for index in range(files_per_directory):
+        (root / f"test_module_{index}.py").write_text("def test_x(): pass\n")
+        (root / f"module_{index}.py").touch()
+    if depth == 0:
+        return nbr_of_directories
+    for index in range(width):
+        prefix = "tests" if index % 2 == 0 else "src"
+        child = root / f"{prefix}_{index}"
+        child.mkdir()
+        nbr_of_directories += create_tree(child, width, depth - 1, files_per_directory)
+    return nbr_of_directories
+
+
+def snapshot_engine(snapshot_path: Path) -> Callable[[FileCollector], None]:
+    """Return a collection engine that uses a directory snapshot.
+
+    Args:
+        snapshot_path: The path of the snapshot file.
+
+    Returns:
+        The collection method to call on an empty :class: `FileCollector`.
+
+    """
+
+    def collect(collector: FileCollector) -> None:
+        collector.snapshot_path = snapshot_path
+        collector.collect_test_directories_and_files()
+
+    return collect
+
+
+def measure(root: Path, collect: Callable[[FileCollector], None]) -> tuple:
+    """Measure the wall time and directory listings of a collection engine.
+
+    Args:
+        root: The root directory to collect.
+        collect: The collection method to call on an empty :class: `FileCollector`.
+
+    Returns:
+        A tuple of wall time in seconds, number of listings and number of files.
+
+    """
+    collector = FileCollector(str(root / "missing"))
+    collector.root_path = root
+    with (
+        mock.patch.object(os, "scandir", wraps=os.scandir) as scandir,
+        mock.patch.object(os, "listdir", wraps=os.listdir) as listdir,
+    ):
+        start = time.perf_counter()
+        collect(collector)
+        elapsed = time.perf_counter() - start
+    return elapsed, scandir.call_count + listdir.call_count, len(collector)
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--width", type=int, default=6)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--files", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "tests"
+        root.mkdir()
+        nbr_of_directories = create_tree(root, args.width, args.depth, args.files)
+        print(f"Directories in tree: {nbr_of_directories}")
+        engines = {
+            "glob": FileCollector.collect_test_directories_and_files_in_parallel,
+            "scandir": FileCollector.collect_test_directories_and_files,
+            "cold": snapshot_engine(Path(tmp) / SNAPSHOT_FILE_NAME),
+            "warm": snapshot_engine(Path(tmp) / SNAPSHOT_FILE_NAME),
+        }
+        for name, collect in engines.items():
+            elapsed, listings, nbr_of_files = measure(root, collect)
+            print(
+                f"{name:>8}: {elapsed * 1000:8.1f} ms, "
+                f"{listings:6d} directory listings, {nbr_of_files} test files",
+            )
+
+
+if __name__ == "__main__":
+    main()
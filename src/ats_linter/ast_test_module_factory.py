@@ -9,16 +9,30 @@ fixtures based on pytest fixtures.
 """
 
 import ast
+import re
 from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 
-from ats_linter.data_classes import Entity, PytestFixture, TestCase, TestClass
+from ats_linter.data_classes import (
+    Entity,
+    LazyCode,
+    PytestFixture,
+    TestCase,
+    TestClass,
+    TestModule,
+)
 
 TEST_PREFIX = "test_"
 TEST_CLASS_PREFIX = "Test"
 PY_EXTENSION = ".py"
 PYTEST_ID = "pytest"
 PYTEST_FIXTURE = "fixture"
+# Bytes that any test case or test class definition contains. Test case names
+# are matched case insensitively, like in ``is_test_case``.
+TEST_DEFINITION_PATTERN = re.compile(
+    rb"\bdef[\s\\]+(?i:%s)|\bclass[\s\\]+%s"
+    % (re.escape(TEST_PREFIX.encode()), re.escape(TEST_CLASS_PREFIX.encode())),
+)
 
 
 @dataclass
@@ -31,6 +45,62 @@ class ASTTestModuleFactory:
     pytest test functions and fixtures based on pytest fixtures.
     """
 
+    @staticmethod
+    def create_test_module(
+        module_name: str,
+        ast_tree: ast.Module,
+        source: str | None = None,
+    ) -> TestModule:
+        """Create a TestModule object from the AST of a module.
+
+        Args:
+            module_name: The name of the module.
+            ast_tree: The AST of the module.
+            source: The source the AST was parsed from. With the source the
+                code of the entities is a :class: `LazyCode`, otherwise it is
+                unparsed from the AST right away.
+
+        Returns:
+            The :class: `TestModule` object.
+
+        """
+        nodes = list(ast.iter_child_nodes(ast_tree))
+        function_nodes = ASTTestModuleFactory.get_function_nodes(nodes)
+        test_classes = ASTTestModuleFactory.get_test_classes(nodes)
+        parsed_test_classes = ASTTestModuleFactory.parse_test_classes(
+            test_classes,
+            source,
+        )
+        test_cases = ASTTestModuleFactory.extract_entities(
+            function_nodes,
+            TestCase,
+            ASTTestModuleFactory.is_test_case,
+            source,
+        )
+        fixtures = ASTTestModuleFactory.extract_entities(
+            function_nodes,
+            PytestFixture,
+            ASTTestModuleFactory.is_pytest_fixture,
+            source,
+        )
+        return TestModule(module_name, parsed_test_classes, test_cases, fixtures)
+
+    @staticmethod
+    def has_test_definitions(content: bytes) -> bool:
+        """Check if the raw content of a file may define test cases or classes.
+
+        This is a cheap scan of the bytes, done before parsing. It can match
+        inside strings or comments, but never misses a definition.
+
+        Args:
+            content: The raw content of the Python file.
+
+        Returns:
+            False if the content cannot define any test case or test class.
+
+        """
+        return TEST_DEFINITION_PATTERN.search(content) is not None
+
     @staticmethod
     def get_test_classes(nodes: list[ast.AST]) -> list[ast.ClassDef]:
         """Get test classes from a list of AST nodes.
@@ -100,11 +170,13 @@ class ASTTestModuleFactory:
     @staticmethod
     def parse_test_classes(
         test_classes: list[ast.ClassDef],
+        source: str | None = None,
     ) -> list[TestClass]:
         """Parse test classes.
 
         Args:
             test_classes: The test classes to parse.
+            source: The source the test classes were parsed from.
 
         Returns:
             The parsed test classes.
@@ -120,11 +192,13 @@ class ASTTestModuleFactory:
                     class_nodes,
                     TestCase,
                     ASTTestModuleFactory.is_test_case,
+                    source,
                 ),
                 ASTTestModuleFactory.extract_entities(
                     class_nodes,
                     PytestFixture,
                     ASTTestModuleFactory.is_pytest_fixture,
+                    source,
                 ),
             )
             parsed_test_classes.append(parsed_test_class)
@@ -135,6 +209,7 @@ class ASTTestModuleFactory:
         nodes: list[ast.AST],
         entity_class: Entity,
         condition: Callable[[ast.AST], bool],
+        source: str | None = None,
     ) -> Sequence[Entity]:
         """Extract entities of a given type from the list of nodes.
 
@@ -142,6 +217,8 @@ class ASTTestModuleFactory:
             nodes: A list of AST nodes to extract entities from.
             entity_class: The class of the entity to extract.
             condition: A function that defines the condition for entity extraction.
+            source: The source the nodes were parsed from, to slice the code
+                of the entities from lazily. Without it the code is unparsed.
 
         Returns:
             A list of entity instances extracted from the nodes.
@@ -152,12 +229,23 @@ class ASTTestModuleFactory:
             if isinstance(node, ast.FunctionDef) and condition(node):
                 docstring = ast.get_docstring(node)
                 # Remove the last line of the function body if it is an expression
-                code = "".join(
-                    [
-                        ast.unparse(line)
-                        for line in node.body
-                        if not isinstance(line, ast.Expr)
-                    ],
-                )
+                statements = [
+                    line for line in node.body if not isinstance(line, ast.Expr)
+                ]
+                if source is None:
+                    code = "".join(ast.unparse(line) for line in statements)
+                else:
+                    code = LazyCode(
+                        source,
+                        tuple(
+                            (
+                                line.lineno,
+                                line.col_offset,
+                                line.end_lineno,
+                                line.end_col_offset,
+                            )
+                            for line in statements
+                        ),
+                    )
                 entities.append(entity_class(node.name, docstring, code))
         return entities
@@ -1,12 +1,25 @@
 """Copyright (c) 2023 Aydin Abdi.
 
 ASTProducer reads files and produces AST(Abstract Syntax Tree)s.
+
+AsyncASTParser either runs ASTProducer and ASTConsumer on the event loop, the
+``async`` backend, or hands chunks of files to a process pool whose workers
+read, parse and extract them and send back only the compact TestModule
+objects, the ``process`` backend. With a cache directory both backends only
+parse the files whose content is not in the :class: `ParseCache`, and only
+read the files whose stat is not in the :class: `StatIndex`.
 """
 
 import ast
 import asyncio
+import multiprocessing
+import os
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import suppress
 from dataclasses import dataclass, field
+from enum import StrEnum
+from importlib.util import decode_source
 from pathlib import Path
 
 from loguru import logger
@@ -16,12 +29,124 @@ from ats_linter.ast_test_module_factory import (
     TEST_PREFIX,
     ASTTestModuleFactory,
 )
-from ats_linter.data_classes import PytestFixture, TestCase, TestModule
+from ats_linter.data_classes import ParseStats, TestModule
+from ats_linter.parse_cache import PARSE_CACHE_DIR_NAME, ParseCache
+from ats_linter.stat_index import STAT_INDEX_FILE_NAME, StatIndex
 
 # Comment out to enable logging
 logger.disable("__name__")
 
 SENTINEL = object()  # Define a sentinel value for the queue
+# Reads are I/O bound, allow more of them in flight than there are cores.
+DEFAULT_MAX_CONCURRENCY = min(32, (os.cpu_count() or 1) + 4)
+DEFAULT_MAX_WORKERS = os.cpu_count() or 1
+# ASTs waiting for the consumer, beyond this the producer waits for it.
+DEFAULT_MAX_QUEUE_SIZE = 2 * DEFAULT_MAX_CONCURRENCY
+# Files per process pool task, large enough that IPC does not dominate.
+DEFAULT_CHUNK_SIZE = 32
+# Chunks in flight per worker, so workers never wait for the next chunk.
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+# Fork is unsafe once the reader threads are running.
+PROCESS_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+# The AST of a file together with the source it was parsed from.
+ParsedSource = tuple[ast.Module, str]
+
+
+class ParserBackend(StrEnum):
+    """The backends AsyncASTParser can parse files with."""
+
+    ASYNC = "async"
+    PROCESS = "process"
+
+
+async def iterate_paths(
+    file_paths: Iterable[Path] | AsyncIterable[Path],
+) -> AsyncIterator[Path]:
+    """Iterate file paths, whether they are an iterable or async iterable.
+
+    Args:
+        file_paths: The file paths.
+
+    Yields:
+        The file paths.
+
+    """
+    if isinstance(file_paths, AsyncIterable):
+        async for file_path in file_paths:
+            yield file_path
+    else:
+        for file_path in file_paths:
+            yield file_path
+
+
+def load_file(
+    file_path: Path,
+    parse_cache: ParseCache | None = None,
+) -> tuple[TestModule | ParsedSource | None, str | None]:
+    """Load a file as its cached test module, or parse it into an AST.
+
+    Args:
+        file_path: The path of the Python file.
+        parse_cache: The cache of extracted test modules, None to always parse.
+
+    Returns:
+        A tuple of the cached :class: `TestModule` or the AST and source of
+        the file, None if the file defines no tests, and the cache key of its
+        content, None without a cache.
+
+    """
+    if parse_cache is None:
+        return ASTProducer._get_ast_tree(file_path), None
+    content, key = parse_cache.load(file_path)
+    if isinstance(content, TestModule):
+        return content, key
+    return ASTProducer._parse_content(content), key
+
+
+def parse_files_chunk(
+    file_paths: list[Path],
+    cache_dir: Path | None = None,
+) -> tuple[list[TestModule], ParseStats, dict[str, list]]:
+    """Read, parse and extract a chunk of files in a worker process.
+
+    Only the extracted TestModule objects are returned, the ASTs never leave
+    the worker process. The content keys of the files are recorded in an in
+    memory :class: `StatIndex` whose entries the parent process merges.
+
+    Args:
+        file_paths: The paths of the Python files to parse.
+        cache_dir: The directory of the :class: `ParseCache`, None to disable.
+
+    Returns:
+        The TestModule objects of the files, the stats of the chunk and the
+        stat index entries recorded for the files.
+
+    """
+    parse_cache = ParseCache(cache_dir, stat_index=StatIndex()) if cache_dir else None
+    test_modules = []
+    nbr_of_skipped_files = 0
+    for file_path in file_paths:
+        loaded, key = load_file(file_path, parse_cache)
+        if loaded is None:
+            nbr_of_skipped_files += 1
+            continue
+        if isinstance(loaded, TestModule):
+            test_modules.append(loaded)
+            continue
+        test_module = ASTTestModuleFactory.create_test_module(file_path.stem, *loaded)
+        if parse_cache:
+            parse_cache.put(key, test_module)
+        test_modules.append(test_module)
+    stats = ParseStats(nbr_of_skipped_files=nbr_of_skipped_files)
+    if parse_cache is None:
+        return test_modules, stats, {}
+    stats.nbr_of_cache_hits = parse_cache.nbr_of_hits
+    stats.nbr_of_cache_misses = parse_cache.nbr_of_misses
+    return test_modules, stats, parse_cache.stat_index.entries
 
 
 @dataclass
@@ -29,18 +154,35 @@ class ASTProducer:
     """Read files and produce AST(Abstract Syntax Tree)s.
 
     This class encapsulates the logic of reading Python files and producing ASTs.
-    The ASTs are produced asynchronously and put in a queue.
+    The files are read and parsed in a thread pool, with up to
+    ``max_concurrency`` files in flight, so read latency overlaps instead of
+    adding up. The ASTs are put in a queue as they complete. The queue is
+    bounded, a file only leaves the ``max_concurrency`` slots once its AST is
+    in the queue, so at most ``max_concurrency`` plus the queue size ASTs are
+    alive at any time. With a :class: `ParseCache` the content of each file is
+    looked up first and a cached TestModule is queued instead of an AST.
 
     Parameters
     ----------
-        file_paths: The list of :class: `Path` objects of the Python files to parse.
-        ast_tree_queue: The queue of ASTs produced from the Python files.
+        file_paths: The :class: `Path` objects of the Python files to parse,
+            either an iterable or an async iterable such as a streaming
+            :class: `FileCollector`, whose paths are parsed as they arrive.
+        ast_tree_queue: The bounded queue of ASTs produced from the Python files.
+        max_concurrency: The maximum number of files read and parsed at once.
+        parse_cache: The cache of extracted test modules, None to always parse.
+        nbr_of_skipped_files: The number of files without test definitions
+            that were not parsed.
         task: The asyncio task that produces the ASTs.
 
     """
 
-    file_paths: list[Path]
-    ast_tree_queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    file_paths: Iterable[Path] | AsyncIterable[Path]
+    ast_tree_queue: asyncio.Queue = field(
+        default_factory=lambda: asyncio.Queue(maxsize=DEFAULT_MAX_QUEUE_SIZE),
+    )
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    parse_cache: ParseCache | None = None
+    nbr_of_skipped_files: int = field(init=False, default=0)
     task: asyncio.Task | None = field(init=False, default=None)
 
     async def __aenter__(self) -> "ASTProducer":
@@ -70,34 +212,103 @@ class ASTProducer:
         if exc_type:
             logger.error(f"Error parsing file: {exc_type}")
 
-        await self.ast_tree_queue.put(
-            SENTINEL,
-        )  # Put the sentinel in the queue to signal completion
+        # Signal completion, without waiting on a full queue nobody consumes
+        with suppress(asyncio.QueueFull):
+            self.ast_tree_queue.put_nowait(SENTINEL)
         logger.debug("ASTProducer has finished producing ast_trees")
 
     async def produce_ast_trees(self) -> None:
         """Produce ASTs from the Python files.
 
         This method reads the Python files and produces ASTs from them.
+        The first error raised while producing an AST cancels the files still
+        in flight and is raised again.
         """
-        for file_path in self.file_paths:
-            ast_tree = self._get_ast_tree(file_path)
-            if ast_tree:
-                await self.ast_tree_queue.put((file_path, ast_tree))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        pending: set[asyncio.Task] = set()
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="ats-linter-reader",
+        )
+        try:
+            async for file_path in self._iter_file_paths():
+                await semaphore.acquire()
+                task = asyncio.create_task(self._produce_ast_tree(executor, file_path))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                task.add_done_callback(lambda _: semaphore.release())
+            await asyncio.gather(*pending)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _produce_ast_tree(self, executor: Executor, file_path: Path) -> None:
+        """Read and parse one file in the executor and queue its AST.
+
+        Args:
+            executor: The executor to read and parse the file in.
+            file_path: The path of the Python file.
+
+        """
+        loop = asyncio.get_event_loop()  # The running loop inside a coroutine
+        loaded, key = await loop.run_in_executor(
+            executor,
+            load_file,
+            file_path,
+            self.parse_cache,
+        )
+        if loaded is None:
+            self.nbr_of_skipped_files += 1
+            logger.debug(f"Skipping {file_path}, it defines no tests")
+            return
+        await self.ast_tree_queue.put((file_path, loaded, key))
+
+    async def _iter_file_paths(self) -> AsyncIterator[Path]:
+        """Iterate the file paths, whether they are an iterable or async iterable.
+
+        Yields:
+            The file paths.
+
+        """
+        async for file_path in iterate_paths(self.file_paths):
+            yield file_path
 
     @staticmethod
-    def _get_ast_tree(file_path: Path) -> ast.Module:
+    def _get_ast_tree(file_path: Path) -> ParsedSource | None:
         """Get the abstract syntax tree (AST) of a Python file.
 
         Args:
             file_path: The path of the Python file.
 
         Returns:
-            The AST of the Python file.
+            The AST and decoded source of the Python file, None if it defines
+            no tests.
 
         """
-        with file_path.open("r") as source:
-            return ast.parse(source.read())
+        return ASTProducer._parse_content(file_path.read_bytes())
+
+    @staticmethod
+    def _parse_content(content: bytes) -> ParsedSource | None:
+        """Parse the raw content of a Python file, unless it defines no tests.
+
+        The source is decoded like the interpreter does, honouring encoding
+        declarations, and kept so that code can be sliced from it later.
+
+        Args:
+            content: The raw content of the Python file.
+
+        Returns:
+            The AST and decoded source of the content, None if the byte
+            prefilter finds no test case or test class definition in it.
+
+        """
+        if not ASTTestModuleFactory.has_test_definitions(content):
+            return None
+        source = decode_source(content)
+        return ast.parse(source), source
 
     @staticmethod
     def is_test_file(file_path: Path) -> bool:
@@ -120,18 +331,22 @@ class ASTConsumer:
     """Parse ASTs into TestModule objects.
 
     This class encapsulates the logic of parsing ASTs into TestModule objects.
-    The ASTs are consumed asynchronously from a queue.
+    The ASTs are consumed asynchronously from a queue. Cached TestModule
+    objects in the queue are taken as they are, the TestModule objects parsed
+    from ASTs are stored in the :class: `ParseCache`.
 
     Parameters
     ----------
         ast_tree_queue: The queue of ASTs produced from the Python files.
         test_modules: The queue of TestModule objects produced from the ASTs.
+        parse_cache: The cache to store the parsed TestModule objects in.
         task: The asyncio task that consumes the ASTs.
 
     """
 
     ast_tree_queue: asyncio.Queue
     test_modules: list[TestModule]
+    parse_cache: ParseCache | None = None
     task: asyncio.Task | None = field(init=False, default=None)
 
     async def __aenter__(self) -> "ASTConsumer":
@@ -169,13 +384,20 @@ class ASTConsumer:
         This method consumes ASTs from the queue and parses them into
         TestModule objects.
         The method will stop consuming ASTs when it encounters the sentinel value.
+        Each AST is released as soon as its TestModule is built.
         """
         while True:
             item = await self.ast_tree_queue.get()
             if item is SENTINEL:  # Check for the sentinel
                 break
-            file_path, ast_tree = item
-            test_module = self.parse_ast_tree(file_path, ast_tree)
+            file_path, loaded, key = item
+            if isinstance(loaded, TestModule):
+                test_module = loaded
+            else:
+                test_module = self.parse_ast_tree(file_path, *loaded)
+                if self.parse_cache and key:
+                    self.parse_cache.put(key, test_module)
+            del item, loaded
             if test_module:
                 self.test_modules.append(
                     test_module,
@@ -183,32 +405,28 @@ class ASTConsumer:
                 logger.debug(f"Test module {test_module} has been parsed")
             self.ast_tree_queue.task_done()
 
-    def parse_ast_tree(self, module_name: Path, ast_tree: ast.Module) -> TestModule:
+    def parse_ast_tree(
+        self,
+        module_name: Path,
+        ast_tree: ast.Module,
+        source: str | None = None,
+    ) -> TestModule:
         """Parse an AST into a TestModule object.
 
         Args:
             module_name: Path to the module.
             ast_tree: The AST of the module.
+            source: The source the AST was parsed from.
 
         Returns:
             The :class: `TestModule` object.
 
         """
-        nodes = list(ast.iter_child_nodes(ast_tree))
-        function_nodes = ASTTestModuleFactory.get_function_nodes(nodes)
-        test_classes = ASTTestModuleFactory.get_test_classes(nodes)
-        parsed_test_classes = ASTTestModuleFactory.parse_test_classes(test_classes)
-        test_cases = ASTTestModuleFactory.extract_entities(
-            function_nodes,
-            TestCase,
-            ASTTestModuleFactory.is_test_case,
-        )
-        fixtures = ASTTestModuleFactory.extract_entities(
-            function_nodes,
-            PytestFixture,
-            ASTTestModuleFactory.is_pytest_fixture,
+        return ASTTestModuleFactory.create_test_module(
+            module_name.stem,
+            ast_tree,
+            source,
         )
-        return TestModule(module_name.stem, parsed_test_classes, test_cases, fixtures)
 
 
 @dataclass
@@ -216,17 +434,35 @@ class AsyncASTParser:
     """Parse Python files into TestModule objects.
 
     This class encapsulates the logic of parsing Python files into TestModule objects.
-    It is used in conjunction with ASTProducer and ASTConsumer.
+    The ``async`` backend uses ASTProducer and ASTConsumer on the event loop,
+    the ``process`` backend spreads the CPU bound parsing and extraction over
+    a pool of worker processes.
 
     Parameters
     ----------
-        file_paths: The paths of the Python files to parse.
+        file_paths: The paths of the Python files to parse, an iterable or an
+            async iterable of paths.
         test_modules: The list of TestModule objects produced from the Python files.
+        max_concurrency: The maximum number of files read and parsed at once.
+        max_queue_size: The maximum number of ASTs waiting for the consumer.
+        backend: The :class: `ParserBackend` to parse the files with.
+        max_workers: The number of worker processes of the ``process`` backend.
+        chunk_size: The number of files per ``process`` backend task.
+        cache_dir: The directory to keep caches between runs in, None to
+            parse every file.
+        stats: The :class: `ParseStats` of the run.
 
     """
 
-    file_paths: list[Path]
+    file_paths: Iterable[Path] | AsyncIterable[Path]
     test_modules: list[TestModule] = field(default_factory=list)
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE
+    backend: ParserBackend = ParserBackend.ASYNC
+    max_workers: int = DEFAULT_MAX_WORKERS
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    cache_dir: str | Path | None = None
+    stats: ParseStats = field(init=False, default_factory=ParseStats)
 
     def __post_init__(self):
         """Initialize the class."""
@@ -241,9 +477,9 @@ class AsyncASTParser:
         await self.gather_producer_consumer_task()
 
     @classmethod
-    async def from_files(cls, file_paths):
+    async def from_files(cls, file_paths, **kwargs):
         """Async factory for use in async test environments."""
-        self = cls(file_paths)
+        self = cls(file_paths, **kwargs)
         await self.run_producer_consumer()
         return self
 
@@ -254,15 +490,141 @@ class AsyncASTParser:
             amount_test_cases += len(test_module)
         return amount_test_cases
 
+    @property
+    def parse_cache_dir(self) -> Path | None:
+        """Return the directory of the parse cache, None if caching is disabled."""
+        return Path(self.cache_dir) / PARSE_CACHE_DIR_NAME if self.cache_dir else None
+
+    def create_parse_cache(self) -> ParseCache | None:
+        """Create the parse cache and its stat index, None if caching is disabled.
+
+        Returns:
+            The :class: `ParseCache` in ``cache_dir``, or None.
+
+        """
+        if not self.cache_dir:
+            return None
+        stat_index = StatIndex(Path(self.cache_dir) / STAT_INDEX_FILE_NAME)
+        return ParseCache(self.parse_cache_dir, stat_index=stat_index)
+
+    @staticmethod
+    def save_parse_cache(parse_cache: ParseCache) -> None:
+        """Save the stat index and prune the parse cache.
+
+        Args:
+            parse_cache: The parse cache of the run.
+
+        """
+        parse_cache.stat_index.save()
+        parse_cache.prune()
+
     async def run_producer_consumer(self):
-        """Run the producer-consumer pattern."""
+        """Run the producer-consumer pattern, or the process pool backend."""
+        parse_cache = self.create_parse_cache()
+        if self.backend == ParserBackend.PROCESS:
+            await self.run_process_pool(parse_cache)
+        else:
+            await self.run_event_loop(parse_cache)
+        if parse_cache:
+            self.stats.nbr_of_cache_hits += parse_cache.nbr_of_hits
+            self.stats.nbr_of_cache_misses += parse_cache.nbr_of_misses
+            loop = asyncio.get_event_loop()  # The running loop inside a coroutine
+            await loop.run_in_executor(None, self.save_parse_cache, parse_cache)
+        logger.debug(f"Parse stats: {self.stats}")
+
+    async def run_event_loop(self, parse_cache: ParseCache | None = None):
+        """Run the producer-consumer pattern on the event loop.
+
+        Args:
+            parse_cache: The parse cache of the run, None to parse every file.
+
+        """
         async with (
-            ASTProducer(self.file_paths) as producer,
-            ASTConsumer(producer.ast_tree_queue, self.test_modules) as consumer,
+            ASTProducer(
+                self.file_paths,
+                ast_tree_queue=asyncio.Queue(maxsize=self.max_queue_size),
+                max_concurrency=self.max_concurrency,
+                parse_cache=parse_cache,
+            ) as producer,
+            ASTConsumer(
+                producer.ast_tree_queue,
+                self.test_modules,
+                parse_cache=parse_cache,
+            ) as consumer,
         ):
             await producer.task
             await producer.ast_tree_queue.put(SENTINEL)  # Signal consumer to stop
             await consumer.task
+        self.stats.nbr_of_skipped_files += producer.nbr_of_skipped_files
+
+    async def run_process_pool(self, parse_cache: ParseCache | None = None):
+        """Parse the files in chunks in a pool of worker processes.
+
+        Chunks are submitted while the file paths are still arriving, with at
+        most ``CHUNKS_IN_FLIGHT_PER_WORKER`` chunks per worker in flight.
+        Files whose stat and test module are cached are not sent to workers.
+
+        Args:
+            parse_cache: The parse cache of the run, None to parse every file.
+
+        """
+        loop = asyncio.get_event_loop()  # The running loop inside a coroutine
+        semaphore = asyncio.Semaphore(self.max_workers * CHUNKS_IN_FLIGHT_PER_WORKER)
+        pending: set[asyncio.Future] = set()
+
+        def collect(future: asyncio.Future) -> None:
+            pending.discard(future)
+            semaphore.release()
+            if not future.cancelled() and future.exception() is None:
+                test_modules, stats, stat_entries = future.result()
+                self.test_modules.extend(test_modules)
+                self.stats.update(stats)
+                if parse_cache:
+                    parse_cache.stat_index.entries.update(stat_entries)
+
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(PROCESS_START_METHOD),
+        )
+        try:
+            chunk: list[Path] = []
+            async for file_path in iterate_paths(self.file_paths):
+                if parse_cache:
+                    test_module = parse_cache.lookup(file_path)
+                    if test_module is not None:
+                        self.test_modules.append(test_module)
+                        continue
+                chunk.append(file_path)
+                if len(chunk) < self.chunk_size:
+                    continue
+                await semaphore.acquire()
+                future = loop.run_in_executor(
+                    executor,
+                    parse_files_chunk,
+                    chunk,
+                    self.parse_cache_dir,
+                )
+                pending.add(future)
+                future.add_done_callback(collect)
+                chunk = []
+            if chunk:
+                await semaphore.acquire()
+                future = loop.run_in_executor(
+                    executor,
+                    parse_files_chunk,
+                    chunk,
+                    self.parse_cache_dir,
+                )
+                pending.add(future)
+                future.add_done_callback(collect)
+            await asyncio.gather(*pending)
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        logger.debug(f"Parsed {len(self.test_modules)} modules in worker processes")
 
     async def gather_producer_consumer_task(self):
         """Gather the producer-consumer task."""
@@ -11,6 +11,8 @@ import typer
 from colorama import just_fix_windows_console
 from loguru import logger
 
+from ats_linter.async_ast_parser import DEFAULT_MAX_WORKERS, ParserBackend
+from ats_linter.file_collector import read_path_list
 from ats_linter.linter import ATSTestCasesFactory, ATSTestCasesLinter
 from ats_linter.parallel_process import FileProcessorCocurrent
 
@@ -21,24 +23,48 @@ logger.add(sys.stderr, colorize=True)
 app = typer.Typer(help="ATS Linter: Lint your test files for docstring compliance.")
 
 
-def _process_files(files_to_process: list[str]) -> list:
-    """Process files and extract test cases."""
+def _extract_test_cases(file_processor: FileProcessorCocurrent) -> list:
+    """Extract the test cases of all modules of a file processor."""
     test_cases = []
-    for file_path in files_to_process:
-        try:
-            file_processor = FileProcessorCocurrent(file_path)
-            for module in file_processor:
-                logger.debug(f"Module: {getattr(module, 'file_path', repr(module))}")
-                for test_class in module.test_classes:
-                    logger.debug(f"  TestClass: {test_class.name}")
-                    test_cases.extend(test_class.test_cases)
-                test_cases.extend(module.test_cases)
-        except Exception as e:
-            logger.error(f"Error parsing file {file_path}: {e}")
-            raise typer.Exit(code=1) from e
+    for module in file_processor:
+        logger.debug(f"Module: {getattr(module, 'file_path', repr(module))}")
+        for test_class in module.test_classes:
+            logger.debug(f"  TestClass: {test_class.name}")
+            test_cases.extend(test_class.test_cases)
+        test_cases.extend(module.test_cases)
     return test_cases
 
 
+def _process_files(
+    files_to_process: list[str],
+    exclude: list[str] | None = None,
+    use_gitignore: bool = False,
+    cache_dir: str | None = None,
+    files_from: str | None = None,
+    backend: ParserBackend = ParserBackend.ASYNC,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list:
+    """Process all files and directories in one pipeline and extract test cases."""
+    try:
+        file_paths = []
+        if files_from:
+            file_paths = read_path_list(files_from)
+            logger.debug(f"Read {len(file_paths)} paths from {files_from}")
+        file_processor = FileProcessorCocurrent(
+            files_to_process or None,
+            exclude=exclude or (),
+            use_gitignore=use_gitignore,
+            cache_dir=cache_dir,
+            file_paths=file_paths,
+            backend=backend,
+            max_workers=max_workers,
+        )
+        return _extract_test_cases(file_processor)
+    except Exception as e:
+        logger.error(f"Error parsing files {files_to_process or files_from}: {e}")
+        raise typer.Exit(code=1) from e
+
+
 @app.command()
 def main(
     files: Annotated[
@@ -48,12 +74,61 @@ def main(
     debug: Annotated[
         bool, typer.Option("--debug", help="Enable debug logging")
     ] = False,
+    exclude: Annotated[
+        list[str],
+        typer.Option(
+            "--exclude",
+            help="Glob of paths to skip during collection (repeatable)",
+        ),
+    ] = None,
+    gitignore: Annotated[
+        bool,
+        typer.Option("--gitignore", help="Skip paths ignored by .gitignore"),
+    ] = False,
+    cache_dir: Annotated[
+        str,
+        typer.Option(
+            "--cache-dir",
+            envvar="ATS_LINTER_CACHE_DIR",
+            help="Directory to keep caches between runs in (disabled by default)",
+        ),
+    ] = None,
+    files_from: Annotated[
+        str,
+        typer.Option(
+            "--files-from",
+            help="Read newline or NUL separated test file paths from FILE, "
+            "or from stdin with '-'",
+        ),
+    ] = None,
+    backend: Annotated[
+        ParserBackend,
+        typer.Option(
+            "--backend",
+            case_sensitive=False,
+            help="Parse in the event loop (async) or in worker processes (process)",
+        ),
+    ] = ParserBackend.ASYNC,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            min=1,
+            help="Number of worker processes of the process backend",
+        ),
+    ] = DEFAULT_MAX_WORKERS,
 ) -> None:
     """Lint test files for docstring compliance.
 
     Args:
         files: Files or directories to lint (default: tests/ directory)
         debug: Enable debug logging
+        exclude: Globs of paths to skip during collection
+        gitignore: Skip paths ignored by .gitignore
+        cache_dir: Directory to keep caches between runs in
+        files_from: File, or '-' for stdin, listing test files to lint
+        backend: Parser backend, async or process
+        workers: Number of worker processes of the process backend
 
     """
     just_fix_windows_console()
@@ -67,11 +142,19 @@ def main(
         logger.add(sys.stderr, level="INFO", colorize=True)
 
     # Determine files to process
-    files_to_process = files if files else ["tests/"]
+    files_to_process = files or ([] if files_from else ["tests/"])
     logger.debug(f"Linting files: {files_to_process}")
 
     # Process files and extract test cases
-    test_cases = _process_files(files_to_process)
+    test_cases = _process_files(
+        files_to_process,
+        exclude,
+        gitignore,
+        cache_dir,
+        files_from,
+        backend,
+        workers,
+    )
 
     if not test_cases:
         logger.warning("No test cases found to lint.")
@@ -6,6 +6,81 @@ This module defines the data classes used in this module.
 from dataclasses import asdict, dataclass
 
 
+class LazyCode:
+    """Represent code that is only sliced out of its source when it is read.
+
+    This is a plain class rather than a dataclass, so that ``asdict`` of a
+    test case copies it as a value instead of expanding the whole source.
+
+    Parameters
+    ----------
+        source: The source of the module the code is part of, shared by all
+            code of the module.
+        spans: The ``(lineno, col_offset, end_lineno, end_col_offset)`` span
+            of every statement of the code, as found on the AST nodes.
+
+    Example:
+        code = LazyCode(source, ((node.lineno, 4, node.end_lineno, 9),))
+        str(code)
+
+    """
+
+    __slots__ = ("source", "spans", "_text")
+
+    def __init__(self, source: str, spans: tuple[tuple[int, int, int, int], ...]):
+        """Initialize the code without slicing it."""
+        self.source = source
+        self.spans = spans
+        self._text: str | None = None
+
+    @property
+    def text(self) -> str:
+        """Return the code, sliced out of the source on first use.
+
+        Returns:
+            The source segments of the statements, one per line.
+
+        """
+        if self._text is None:
+            lines = self.source.split("\n")
+            segments = []
+            for lineno, col_offset, end_lineno, end_col_offset in self.spans:
+                # Column offsets are UTF-8 byte offsets
+                span_lines = [line.encode() for line in lines[lineno - 1 : end_lineno]]
+                span_lines[-1] = span_lines[-1][:end_col_offset]
+                span_lines[0] = span_lines[0][col_offset:]
+                segments.append(b"\n".join(span_lines).decode())
+            self._text = "\n".join(segments)
+        return self._text
+
+    def __str__(self) -> str:
+        """Return the code."""
+        return self.text
+
+    def __repr__(self) -> str:
+        """Return the representation of the code, without the source."""
+        return f"LazyCode(spans={self.spans!r})"
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the code with other code or a string."""
+        if isinstance(other, LazyCode | str):
+            return self.text == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        """Return the hash of the code."""
+        return hash(self.text)
+
+    def __getstate__(self) -> tuple:
+        """Pickle the source and spans, never the sliced code."""
+        return self.source, self.spans
+
+    def __setstate__(self, state: tuple) -> None:
+        """Restore the source and spans."""
+        self.source, self.spans = state
+        self._text = None
+
+
 @dataclass(frozen=True)
 class TestCase:
     """Represent a test case.
@@ -22,7 +97,7 @@ class TestCase:
 
     name: str
     docstring: str
-    code: str
+    code: str | LazyCode
 
 
 @dataclass(frozen=True)
@@ -39,7 +114,7 @@ class PytestFixture:
 
     name: str
     docstring: str | None
-    code: str
+    code: str | LazyCode
 
 
 @dataclass(frozen=True)
@@ -56,7 +131,7 @@ class Entity:
 
     name: str
     docstring: str | None
-    code: str
+    code: str | LazyCode
 
 
 @dataclass(frozen=True)
@@ -102,6 +177,15 @@ class TestClass:
             "nbr_of_fixtures": len(self.fixtures),
         }
 
+    def __reduce__(self) -> tuple:
+        """Pickle by fields, since ``__dict__`` is overridden.
+
+        Returns:
+            The class and the field values to recreate the test class with.
+
+        """
+        return type(self), tuple(getattr(self, f) for f in self.__dataclass_fields__)
+
 
 @dataclass(frozen=True)
 class TestModule:
@@ -150,6 +234,61 @@ class TestModule:
             "fixtures": [asdict(fixture) for fixture in self.fixtures],
         }
 
+    def __reduce__(self) -> tuple:
+        """Pickle by fields, since ``__dict__`` is overridden.
+
+        Returns:
+            The class and the field values to recreate the test module with.
+
+        """
+        return type(self), tuple(getattr(self, f) for f in self.__dataclass_fields__)
+
+
+@dataclass(frozen=True)
+class DirectoryListing:
+    """Represent the result of listing a single directory once.
+
+    Parameters
+    ----------
+        subdirectories: The names of the subdirectories to descend into.
+        test_files: The names of the files matching the test file pattern.
+        has_test_entry: True if any entry starts with the test file prefix.
+
+    """
+
+    subdirectories: tuple[str, ...]
+    test_files: tuple[str, ...]
+    has_test_entry: bool
+
+
+@dataclass
+class ParseStats:
+    """Represent the counters of a parse run.
+
+    Parameters
+    ----------
+        nbr_of_cache_hits: The number of test modules read from the parse cache.
+        nbr_of_cache_misses: The number of files parsed because they were not cached.
+        nbr_of_skipped_files: The number of files not parsed because they
+            define no tests.
+
+    """
+
+    nbr_of_cache_hits: int = 0
+    nbr_of_cache_misses: int = 0
+    nbr_of_skipped_files: int = 0
+
+    def update(self, other: "ParseStats") -> None:
+        """Add the counters of another parse run.
+
+        Args:
+            other: The stats to add.
+
+        """
+        self.nbr_of_cache_hits += other.nbr_of_cache_hits
+        self.nbr_of_cache_misses += other.nbr_of_cache_misses
+        self.nbr_of_skipped_files += other.nbr_of_skipped_files
+
 
 @dataclass
 class Section:
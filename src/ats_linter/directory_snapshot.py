@@ -0,0 +1,142 @@
+"""Copyright (c) 2023 Aydin Abdi.
+
+This module defines a persistent snapshot of directory listings.
+
+A directory's mtime changes whenever an entry is added, removed or renamed in
+it, so a listing recorded together with the directory's mtime and inode stays
+valid for as long as both are unchanged. Reusing such a listing costs one
+``stat`` instead of reading the whole directory.
+
+Example:
+    snapshot = DirectorySnapshot(Path('.ats_linter_cache/directory_snapshot.json'))
+    listing = snapshot.get('/path/to/directory', os.stat('/path/to/directory'))
+    snapshot.save()
+
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+from ats_linter.data_classes import DirectoryListing
+
+# Comment out to enable logging
+logger.disable(__name__)
+
+SNAPSHOT_FILE_NAME = "directory_snapshot.json"
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+@dataclass
+class DirectorySnapshot:
+    """Keep the listings of directories on disk between runs.
+
+    Every entry maps an absolute directory path to its mtime, inode and
+    :class: `DirectoryListing`. Entries of directories that were not visited
+    during a run below one of its roots are dropped when saving, so deleted
+    directories do not accumulate.
+
+    Parameters
+    ----------
+        snapshot_path: The path of the snapshot file.
+        entries: The snapshot entries by absolute directory path.
+        nbr_of_hits: The number of listings reused from the snapshot.
+        nbr_of_misses: The number of listings that had to be read again.
+
+    """
+
+    snapshot_path: Path
+    entries: dict[str, list] = field(init=False, default_factory=dict)
+    nbr_of_hits: int = field(init=False, default=0)
+    nbr_of_misses: int = field(init=False, default=0)
+    _visited: set[str] = field(init=False, default_factory=set, repr=False)
+    _roots: set[str] = field(init=False, default_factory=set, repr=False)
+
+    def __post_init__(self):
+        """Load the snapshot file, starting empty if it is missing or invalid."""
+        try:
+            content = json.loads(self.snapshot_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.debug(f"No usable snapshot at {self.snapshot_path}: {e}")
+            return
+        if content.get("version") == SNAPSHOT_FORMAT_VERSION:
+            self.entries = content.get("directories", {})
+
+    def add_root(self, root: str) -> None:
+        """Register a root directory walked during this run.
+
+        Args:
+            root: The absolute path of the root directory.
+
+        """
+        self._roots.add(root)
+
+    def get(self, directory: str, stat: os.stat_result) -> DirectoryListing | None:
+        """Return the recorded listing of a directory if it is still valid.
+
+        Args:
+            directory: The absolute path of the directory.
+            stat: The current stat result of the directory.
+
+        Returns:
+            The recorded :class: `DirectoryListing`, or None if the directory
+            was not recorded or has changed since.
+
+        """
+        self._visited.add(directory)
+        entry = self.entries.get(directory)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_ino:
+            self.nbr_of_hits += 1
+            return DirectoryListing(tuple(entry[2]), tuple(entry[3]), entry[4])
+        self.nbr_of_misses += 1
+        return None
+
+    def put(
+        self,
+        directory: str,
+        stat: os.stat_result,
+        listing: DirectoryListing,
+    ) -> None:
+        """Record the listing of a directory.
+
+        Args:
+            directory: The absolute path of the directory.
+            stat: The stat result of the directory taken before it was listed.
+            listing: The listing of the directory.
+
+        """
+        self._visited.add(directory)
+        self.entries[directory] = [
+            stat.st_mtime_ns,
+            stat.st_ino,
+            listing.subdirectories,
+            listing.test_files,
+            listing.has_test_entry,
+        ]
+
+    def save(self) -> None:
+        """Write the snapshot atomically, dropping directories that disappeared."""
+        prefixes = tuple(f"{root.rstrip(os.sep)}{os.sep}" for root in self._roots)
+        self.entries = {
+            directory: entry
+            for directory, entry in self.entries.items()
+            if directory in self._visited
+            or not (directory in self._roots or directory.startswith(prefixes))
+        }
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path = self.snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+            temporary_path.write_text(
+                json.dumps(
+                    {
+                        "version": SNAPSHOT_FORMAT_VERSION,
+                        "directories": self.entries,
+                    },
+                ),
+            )
+            os.replace(temporary_path, self.snapshot_path)
+        except OSError as e:
+            logger.error(f"Could not save snapshot {self.snapshot_path}: {e}")
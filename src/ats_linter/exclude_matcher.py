@@ -0,0 +1,228 @@
+"""Copyright (c) 2023 Aydin Abdi.
+
+This module defines a matcher for paths that are excluded from collection.
+
+The built-in default excludes, user supplied exclude globs and optionally the
+``.gitignore`` rules are compiled into one regular expression, so pruning a
+directory costs a single match no matter how many patterns are active.
+
+Example:
+    matcher = ExcludeMatcher(Path('/path/to/root'), ["generated_*"])
+    matcher.is_excluded("node_modules", is_dir=True)
+
+"""
+
+import re
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+# Comment out to enable logging
+logger.disable(__name__)
+
+DEFAULT_EXCLUDES = (
+    ".git",
+    ".hg",
+    ".svn",
+    ".tox",
+    ".nox",
+    ".venv",
+    "venv",
+    ".eggs",
+    "*.egg-info",
+    "node_modules",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "build",
+    "dist",
+)
+GITIGNORE_FILE = ".gitignore"
+GIT_DIRECTORY = ".git"
+NEGATION_PREFIX = "!"
+COMMENT_PREFIX = "#"
+MATCH_NOTHING = "(?!)"
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore style glob into a regular expression.
+
+    ``*`` and ``?`` do not match ``/``, ``**`` matches across directories and
+    a leading ``**/`` also matches no directory at all.
+
+    Args:
+        pattern: The glob pattern to translate.
+
+    Returns:
+        The regular expression matching the pattern, without anchors.
+
+    """
+    regex = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            regex.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            regex.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[" and "]" in pattern[index + 1 :]:
+            end = pattern.index("]", index + 1)
+            content = pattern[index + 1 : end].replace("\\", "\\\\")
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            regex.append(f"[{content}]")
+            index = end
+        else:
+            regex.append(re.escape(char))
+        index += 1
+    return "".join(regex)
+
+
+@dataclass
+class ExcludeMatcher:
+    """Decide whether a path below a root directory is excluded from collection.
+
+    Paths are matched relative to the root directory. Patterns without a
+    ``/`` match the name of an entry at any depth, patterns with a ``/`` are
+    anchored at the root directory. Patterns read from ``.gitignore`` files
+    are anchored at the directory of the file they come from, a trailing
+    ``/`` restricts a pattern to directories and a leading ``!`` re-includes
+    anything the pattern matches.
+
+    Parameters
+    ----------
+        root_path: The root directory of the collection.
+        patterns: The exclude globs in addition to the default excludes.
+        use_gitignore: Whether to also apply the ``.gitignore`` rules.
+        use_default_excludes: Whether to apply ``DEFAULT_EXCLUDES``.
+
+    Example:
+        matcher = ExcludeMatcher(Path('/path/to/root'), use_gitignore=True)
+        matcher.is_excluded("tests/fixtures", is_dir=True)
+
+    """
+
+    root_path: Path
+    patterns: Sequence[str] = ()
+    use_gitignore: bool = False
+    use_default_excludes: bool = True
+    _base: str = field(init=False, repr=False)
+    _exclude_regex: re.Pattern = field(init=False, repr=False)
+    _include_regex: re.Pattern = field(init=False, repr=False)
+
+    def __post_init__(self):
+        """Compile all rules into one exclude and one re-include expression."""
+        self._base = self.root_path.resolve().as_posix().rstrip("/")
+        excludes = []
+        includes = []
+        patterns = list(self.patterns)
+        if self.use_default_excludes:
+            patterns = [*DEFAULT_EXCLUDES, *patterns]
+        excludes.extend(self._compile_pattern(self._base, p) for p in patterns)
+        if self.use_gitignore:
+            for base, pattern in self.read_gitignore_rules(self.root_path):
+                negated = pattern.startswith(NEGATION_PREFIX)
+                if negated:
+                    pattern = pattern[len(NEGATION_PREFIX) :]
+                rule = self._compile_gitignore_pattern(base, pattern)
+                (includes if negated else excludes).append(rule)
+        self._exclude_regex = re.compile("|".join(excludes) or MATCH_NOTHING)
+        self._include_regex = re.compile("|".join(includes) or MATCH_NOTHING)
+        logger.debug(
+            f"Compiled {len(excludes)} exclude and {len(includes)} include rules",
+        )
+
+    def is_excluded(self, relative_path: str, is_dir: bool) -> bool:
+        """Check if a path is excluded.
+
+        Args:
+            relative_path: The posix path relative to the root directory.
+            is_dir: Whether the path is a directory.
+
+        Returns:
+            True if the path is excluded, False otherwise.
+
+        """
+        subject = f"{self._base}/{relative_path}"
+        if is_dir:
+            subject += "/"
+        return bool(
+            self._exclude_regex.match(subject)
+            and not self._include_regex.match(subject),
+        )
+
+    @staticmethod
+    def _compile_pattern(base: str, pattern: str) -> str:
+        """Compile an exclude glob into an anchored regular expression.
+
+        Args:
+            base: The absolute posix path the pattern is relative to.
+            pattern: The exclude glob.
+
+        Returns:
+            The regular expression source of the pattern.
+
+        """
+        pattern = pattern.strip("/")
+        prefix = "/" if "/" in pattern else "/(?:.*/)?"
+        return f"{re.escape(base)}{prefix}{glob_to_regex(pattern)}/?$"
+
+    @staticmethod
+    def _compile_gitignore_pattern(base: str, pattern: str) -> str:
+        """Compile a ``.gitignore`` pattern into an anchored regular expression.
+
+        Args:
+            base: The absolute posix path of the directory of the ``.gitignore``.
+            pattern: The pattern without its negation prefix.
+
+        Returns:
+            The regular expression source of the pattern.
+
+        """
+        directory_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        prefix = "/" if anchored else "/(?:.*/)?"
+        suffix = "/$" if directory_only else "/?$"
+        return f"{re.escape(base)}{prefix}{glob_to_regex(pattern.lstrip('/'))}{suffix}"
+
+    @staticmethod
+    def read_gitignore_rules(root_path: Path) -> Iterator[tuple[str, str]]:
+        """Read the ``.gitignore`` rules that apply to a root directory.
+
+        The ``.gitignore`` files of the root directory and of its parents up to
+        the top of the git repository are read. Outside of a git repository
+        only the ``.gitignore`` of the root directory is read.
+
+        Args:
+            root_path: The root directory of the collection.
+
+        Yields:
+            A tuple of the directory the rule is relative to and the rule.
+
+        """
+        lineage = [root_path.resolve(), *root_path.resolve().parents]
+        top = next(
+            (i for i, d in enumerate(lineage) if (d / GIT_DIRECTORY).exists()),
+            0,
+        )
+        for directory in reversed(lineage[: top + 1]):
+            gitignore = directory / GITIGNORE_FILE
+            if not gitignore.is_file():
+                continue
+            base = directory.as_posix().rstrip("/")
+            for line in gitignore.read_text(errors="replace").splitlines():
+                rule = line.rstrip()
+                if rule and not rule.startswith(COMMENT_PREFIX):
+                    yield base, rule
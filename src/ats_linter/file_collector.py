@@ -7,15 +7,29 @@ Example:
     print(test_directory.test_directories)
     print(test_directory.test_files)
 
+    In streaming mode the test files are yielded as they are discovered:
+
+    for test_file in FileCollector('/path/to/root/directory', stream=True):
+        print(test_file)
+
 """
 
-from collections.abc import Iterable
+import asyncio
+import os
+import sys
+import threading
+from collections.abc import AsyncIterator, Iterator, Sequence
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import InitVar, asdict, dataclass, field
+from fnmatch import fnmatchcase
 from pathlib import Path
 
 from loguru import logger
 
+from ats_linter.data_classes import DirectoryListing
+from ats_linter.directory_snapshot import DirectorySnapshot
+from ats_linter.exclude_matcher import ExcludeMatcher
+
 # Comment out to enable logging
 logger.disable(__name__)
 
@@ -25,6 +39,241 @@ TEST_FILE_PREFIXES = "test_"
 PYTHON_FILE_EXTENSION = ".py"
 TEST_FILE_PATTERN = f"{TEST_FILE_PREFIXES[0]}*{PYTHON_FILE_EXTENSION}"
 All_RECRUSIVE_PATTERN = "**/"
+END_OF_COLLECTION = object()  # Marks the end of a streamed collection
+STDIN_PATH = "-"
+NUL_SEPARATOR = b"\0"
+
+
+async def iterate_in_thread(paths: Iterator[Path]) -> AsyncIterator[Path]:
+    """Run a blocking path iterator in a worker thread and yield its paths.
+
+    The event loop stays free while the iterator runs, so the paths can be
+    consumed, e.g. parsed, while they are still being produced.
+
+    Args:
+        paths: The blocking iterator of paths.
+
+    Yields:
+        The paths in the order the iterator produces them.
+
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def feed() -> None:
+        try:
+            for path in paths:
+                if stop.is_set():
+                    return
+                loop.call_soon_threadsafe(queue.put_nowait, path)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, END_OF_COLLECTION)
+
+    walk = loop.run_in_executor(None, feed)
+    try:
+        while (path := await queue.get()) is not END_OF_COLLECTION:
+            yield path
+    finally:
+        stop.set()
+        await walk
+
+
+def read_path_list(source: str) -> list[Path]:
+    """Read a list of paths from a file or from standard input.
+
+    The paths are separated by NUL characters if the content holds any, e.g.
+    the output of ``git diff -z --name-only``, and by newlines otherwise.
+
+    Args:
+        source: The path of the file to read, or ``-`` for standard input.
+
+    Returns:
+        The paths in the order they are listed, without empty entries.
+
+    """
+    if source == STDIN_PATH:
+        content = sys.stdin.buffer.read()
+    else:
+        content = Path(source).read_bytes()
+    entries = (
+        content.split(NUL_SEPARATOR)
+        if NUL_SEPARATOR in content
+        else content.splitlines()
+    )
+    return [Path(os.fsdecode(entry)) for entry in entries if entry.strip()]
+
+
+@dataclass
+class DirectoryWalker:
+    """Walk a directory tree with :func:`os.scandir` reading each directory once.
+
+    The ``DirEntry`` objects returned by :func:`os.scandir` already carry the
+    entry type, so one listing per directory is enough to decide whether the
+    directory is a test directory, which test files it holds and which
+    subdirectories to descend into. Symbolic links to directories are not
+    followed, the same as ``Path.glob("**/")``. Directories rejected by the
+    exclude matcher are pruned and never listed. With a snapshot, directories
+    whose mtime and inode are unchanged since the last run are not listed
+    either, their recorded listing is reused after a single ``stat``.
+
+    Parameters
+    ----------
+        root_path: The root directory to walk.
+        exclude_matcher: The matcher of excluded paths, None to walk everything.
+        snapshot: The snapshot of directory listings, None to list everything.
+        nbr_of_listings: The number of directory listings performed so far.
+
+    Example:
+        walker = DirectoryWalker(Path('/path/to/root/directory'))
+        for directory, files in walker.walk():
+            print(directory, files)
+
+    """
+
+    root_path: Path
+    exclude_matcher: ExcludeMatcher | None = None
+    snapshot: DirectorySnapshot | None = None
+    nbr_of_listings: int = field(init=False, default=0)
+    _absolute_root: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        """Resolve the absolute root used to key the snapshot entries."""
+        self._absolute_root = os.path.abspath(self.root_path)
+        if self.snapshot is not None:
+            self.snapshot.add_root(self._absolute_root)
+
+    def walk(self) -> Iterator[tuple[Path, list[Path]]]:
+        """Walk the tree and yield every test directory with its test files.
+
+        Directories are visited depth first in sorted order, so the result is
+        deterministic regardless of the order the file system returns entries.
+
+        Yields:
+            A tuple containing a test directory and its test files.
+
+        """
+        stack = [(self.root_path, "")]
+        while stack:
+            directory, relative_path = stack.pop()
+            listing = self._get_listing(directory, relative_path)
+            if listing is None:
+                continue
+            if listing.has_test_entry and directory.name.lower().startswith(
+                TEST_DIRECTORY_PREFIXES,
+            ):
+                yield (
+                    directory,
+                    [
+                        directory / name
+                        for name in self._included(
+                            relative_path, listing.test_files, False
+                        )
+                    ],
+                )
+            stack.extend(
+                (directory / name, f"{relative_path}{name}/")
+                for name in reversed(
+                    self._included(relative_path, listing.subdirectories, True),
+                )
+            )
+
+    def _included(
+        self,
+        relative_path: str,
+        names: tuple[str, ...],
+        is_dir: bool,
+    ) -> list[str]:
+        """Filter out the names of a directory listing that are excluded.
+
+        Args:
+            relative_path: The path of the listed directory relative to the root,
+                either empty or ending with ``/``.
+            names: The names to filter.
+            is_dir: Whether the names are directories.
+
+        Returns:
+            The names that are not excluded.
+
+        """
+        if self.exclude_matcher is None:
+            return list(names)
+        return [
+            name
+            for name in names
+            if not self.exclude_matcher.is_excluded(f"{relative_path}{name}", is_dir)
+        ]
+
+    def _get_listing(
+        self,
+        directory: Path,
+        relative_path: str,
+    ) -> DirectoryListing | None:
+        """Get the listing of a directory from the snapshot or by listing it.
+
+        Args:
+            directory: The directory to list.
+            relative_path: The path of the directory relative to the root,
+                either empty or ending with ``/``.
+
+        Returns:
+            The :class: `DirectoryListing` of the directory, or None if the
+            directory could not be read.
+
+        """
+        if self.snapshot is None:
+            return self.list_directory(directory)
+        key = os.path.join(self._absolute_root, relative_path.rstrip("/"))
+        key = key.rstrip(os.sep) or os.sep
+        try:
+            # Stat before listing, so a change during the listing is seen next run.
+            stat = os.stat(directory)
+        except OSError as e:
+            logger.error(f"Could not stat directory {directory}: {e}")
+            return None
+        listing = self.snapshot.get(key, stat)
+        if listing is None:
+            listing = self.list_directory(directory)
+            if listing is not None:
+                self.snapshot.put(key, stat, listing)
+        return listing
+
+    def list_directory(self, directory: Path) -> DirectoryListing | None:
+        """List a directory with a single :func:`os.scandir` call.
+
+        Args:
+            directory: The directory to list.
+
+        Returns:
+            The :class: `DirectoryListing` of the directory, or None if the
+            directory could not be read.
+
+        """
+        self.nbr_of_listings += 1
+        subdirectories = []
+        test_files = []
+        has_test_entry = False
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.startswith(TEST_FILE_PREFIXES):
+                        has_test_entry = True
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(name)
+                        elif fnmatchcase(name, TEST_FILE_PATTERN) and entry.is_file():
+                            test_files.append(name)
+                    except OSError as e:
+                        logger.debug(f"Skipping entry {entry.path}: {e}")
+        except OSError as e:
+            logger.error(f"Could not list directory {directory}: {e}")
+            return None
+        return DirectoryListing(
+            tuple(sorted(subdirectories)),
+            tuple(sorted(test_files)),
+            has_test_entry,
+        )
 
 
 @dataclass
@@ -34,6 +283,11 @@ class FileCollector:
     Parameters
     ----------
         root_file_path: The path of the root directory or file.
+        exclude: The globs of paths to exclude in addition to ``DEFAULT_EXCLUDES``.
+        use_gitignore: Whether to also exclude paths ignored by ``.gitignore``.
+        snapshot_path: The path of the :class: `DirectorySnapshot` file that
+            lets unchanged directories be reused between runs, None to disable.
+        stream: Whether to defer the collection until the collector is iterated.
         root_path: The root directory as a Path object.
         test_directories: A list of all directories that contain test files.
         test_files: A list of all test files.
@@ -43,24 +297,53 @@ class FileCollector:
         print(test_directory.test_directories)
         print(test_directory.test_files)
 
+    In streaming mode nothing is collected on initialization. Iterating the
+    collector, synchronously or with ``async for``, walks the tree and yields
+    every test file as soon as it is found. The ``test_directories`` and
+    ``test_files`` lists are filled along the way and are complete once the
+    iteration has finished.
+
     """
 
     root_file_path: InitVar[str]
+    exclude: Sequence[str] = ()
+    use_gitignore: bool = False
+    snapshot_path: str | Path | None = None
+    stream: bool = False
     root_path: Path = field(init=False)
     test_directories: list[Path] = field(default_factory=list, init=False)
     test_files: list[Path] = field(default_factory=list, init=False)
+    collected: bool = field(default=False, init=False)
 
     def __post_init__(self, root_file_path: str):
         """Initialize a FileCollector object.
 
         If the root_file_path is a file, add it to the test_files list.
         If it is a directory, collect all test directories and files.
+        In streaming mode the collection is deferred to the iteration.
 
         Args:
             root_file_path: The path of the root directory or file.
 
         """
         self.root_path = FileCollector.get_path_from_string(root_file_path)
+        if not self.stream:
+            for _ in self.iter_test_files():
+                pass
+
+    def iter_test_files(self) -> Iterator[Path]:
+        """Collect the test files and yield each one as soon as it is found.
+
+        The collection runs only once, later calls yield the collected files.
+
+        Yields:
+            The test files.
+
+        """
+        if self.collected:
+            yield from self.test_files
+            return
+        self.collected = True
         # If the root path does not exist, log an error and return.
         if not self.root_path.exists():
             logger.error(f"Path {self.root_path} does not exist.")
@@ -69,10 +352,25 @@ class FileCollector:
         if FileCollector.is_test_file(self.root_path):
             logger.debug(f"Root path is a test file: {self.root_path}")
             self.test_files.append(self.root_path)
+            yield self.root_path
         # If the root path is a directory, collect all test directories and files.
         if self.root_path.is_dir():
             logger.debug(f"Root path is a directory: {self.root_path}")
-            self.collect_test_directories_and_files_in_parallel()
+            for _, files in self.iter_test_directories_and_files():
+                yield from files
+
+    async def __aiter__(self) -> AsyncIterator[Path]:
+        """Walk the tree in a worker thread and yield test files as they are found.
+
+        The event loop stays free while the tree is walked, so the paths can be
+        consumed, e.g. parsed, while the traversal is still running.
+
+        Yields:
+            The test files.
+
+        """
+        async for path in iterate_in_thread(self.iter_test_files()):
+            yield path
 
     def __dict__(self) -> dict:  # type: ignore
         """Return the FileCollector object as a dictionary.
@@ -96,9 +394,11 @@ class FileCollector:
         """
         return len(self.test_files)
 
-    def __iter__(self) -> Iterable[Path]:
+    def __iter__(self) -> Iterator[Path]:
         """Return an iterator for the test files.
 
+        In streaming mode the iterator collects the test files lazily.
+
         Returns:
             An iterator for the test files.
 
@@ -108,7 +408,7 @@ class FileCollector:
                 print(test_file)
 
         """
-        return iter(self.test_files)
+        return self.iter_test_files()
 
     @staticmethod
     def get_path_from_string(file_path: str) -> Path:
@@ -175,9 +475,49 @@ class FileCollector:
             file.name.startswith(TEST_FILE_PREFIXES) for file in directory.iterdir()
         )
 
+    def collect_test_directories_and_files(self) -> None:
+        """Collect all test directories and files with a single tree walk.
+
+        Every directory below the root path is listed exactly once by
+        :class: `DirectoryWalker`, excluded directories are never entered.
+        """
+        for _ in self.iter_test_directories_and_files():
+            pass
+
+    def iter_test_directories_and_files(self) -> Iterator[tuple[Path, list[Path]]]:
+        """Walk the tree and yield every test directory with its test files.
+
+        The directories and files are added to ``test_directories`` and
+        ``test_files`` as they are yielded.
+
+        Yields:
+            A tuple containing a test directory and its test files.
+
+        """
+        exclude_matcher = ExcludeMatcher(
+            self.root_path,
+            self.exclude,
+            self.use_gitignore,
+        )
+        snapshot = (
+            DirectorySnapshot(Path(self.snapshot_path)) if self.snapshot_path else None
+        )
+        walker = DirectoryWalker(self.root_path, exclude_matcher, snapshot)
+        for directory, files in walker.walk():
+            self.test_directories.append(directory)
+            self.test_files.extend(files)
+            yield directory, files
+        logger.debug(f"Listed {walker.nbr_of_listings} directories")
+        if snapshot is not None:
+            logger.debug(f"Reused {snapshot.nbr_of_hits} snapshot listings")
+            snapshot.save()
+
     def collect_test_directories_and_files_in_parallel(self) -> None:
         """Collect all test directories and files in parallel.
 
+        This is the glob based collection which lists every test directory
+        several times. Prefer :meth: `collect_test_directories_and_files`.
+
         If the root directory is a file, simply add it to the test files and return.
         If the root directory is a directory, collect all test directories and files.
         """
@@ -198,3 +538,130 @@ class FileCollector:
                         self.test_files.extend(files)
                 except Exception as e:
                     logger.error(f"An exception occurred: {e}")
+
+
+@dataclass
+class MultiFileCollector:
+    """Collect test files from several roots and listed files as one stream.
+
+    Roots that refer to the same file or directory are collected once. Files
+    reached from several roots, e.g. through ``tests/`` and ``tests/unit/``,
+    are yielded once, identified by their device and inode.
+
+    Parameters
+    ----------
+        root_file_paths: The paths of the root directories or files.
+        file_paths: The paths of listed files to include without discovery.
+        exclude: The globs of paths to exclude in addition to ``DEFAULT_EXCLUDES``.
+        use_gitignore: Whether to also exclude paths ignored by ``.gitignore``.
+        snapshot_path: The path of the :class: `DirectorySnapshot` file.
+        stream: Whether to defer the collection until the collector is iterated.
+        file_collectors: The :class: `FileCollector` of every distinct root.
+        test_files: A list of all distinct test files.
+
+    Example:
+        collector = MultiFileCollector(['tests/', 'tests/unit/'])
+        print(collector.test_files)
+
+    """
+
+    root_file_paths: Sequence[str]
+    file_paths: Sequence[Path] = ()
+    exclude: Sequence[str] = ()
+    use_gitignore: bool = False
+    snapshot_path: str | Path | None = None
+    stream: bool = False
+    file_collectors: list[FileCollector] = field(init=False, default_factory=list)
+    test_files: list[Path] = field(init=False, default_factory=list)
+    collected: bool = field(default=False, init=False)
+
+    def __post_init__(self):
+        """Create one streaming collector per distinct root."""
+        seen_roots = set()
+        for root_file_path in self.root_file_paths:
+            key = self.get_file_key(Path(root_file_path))
+            if key is not None and key in seen_roots:
+                logger.debug(f"Skipping duplicate root {root_file_path}")
+                continue
+            seen_roots.add(key)
+            self.file_collectors.append(
+                FileCollector(
+                    root_file_path,
+                    exclude=self.exclude,
+                    use_gitignore=self.use_gitignore,
+                    snapshot_path=self.snapshot_path,
+                    stream=True,
+                ),
+            )
+        if not self.stream:
+            for _ in self.iter_test_files():
+                pass
+
+    @staticmethod
+    def get_file_key(path: Path) -> tuple[int, int] | None:
+        """Return the device and inode identifying a file.
+
+        Args:
+            path: The path of the file.
+
+        Returns:
+            The device and inode of the file, or None if it does not exist.
+
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def iter_test_files(self) -> Iterator[Path]:
+        """Collect the distinct test files and yield each one as it is found.
+
+        Yields:
+            The test files.
+
+        """
+        if self.collected:
+            yield from self.test_files
+            return
+        self.collected = True
+        seen_files = set()
+        listed_files = (
+            path for path in self.file_paths if FileCollector.is_test_file(path)
+        )
+        for collector_files in (*self.file_collectors, listed_files):
+            for path in collector_files:
+                key = self.get_file_key(path)
+                if key in seen_files:
+                    continue
+                seen_files.add(key)
+                self.test_files.append(path)
+                yield path
+
+    def __iter__(self) -> Iterator[Path]:
+        """Return an iterator for the test files.
+
+        Returns:
+            An iterator for the test files.
+
+        """
+        return self.iter_test_files()
+
+    async def __aiter__(self) -> AsyncIterator[Path]:
+        """Collect in a worker thread and yield test files as they are found.
+
+        Yields:
+            The test files.
+
+        """
+        async for path in iterate_in_thread(self.iter_test_files()):
+            yield path
+
+    def __len__(self) -> int:
+        """Return the number of test files.
+
+        Returns:
+            The number of test files.
+
+        """
+        return len(self.test_files)
@@ -3,31 +3,118 @@
 FileProcessorCocurrent is a class for processing files in parallel.
 """
 
+from collections.abc import Sequence
 from dataclasses import asdict, dataclass, field
+from pathlib import Path
 
 from loguru import logger
 
-from ats_linter.async_ast_parser import AsyncASTParser
-from ats_linter.file_collector import FileCollector
+from ats_linter.async_ast_parser import (
+    DEFAULT_MAX_WORKERS,
+    AsyncASTParser,
+    ParserBackend,
+)
+from ats_linter.directory_snapshot import SNAPSHOT_FILE_NAME
+from ats_linter.file_collector import FileCollector, MultiFileCollector
 
 
 @dataclass
 class FileProcessorCocurrent:
-    """A class for processing files in parallel."""
+    """A class for processing files in parallel.
 
-    root_path: str
-    test_file_collector: FileCollector = field(init=False)
+    Parameters
+    ----------
+        root_path: The path of the root directory or file, or a sequence of
+            such paths collected together, None if the files to process are
+            only given by ``file_paths``.
+        exclude: The globs of paths to exclude from the collection.
+        use_gitignore: Whether to also exclude paths ignored by ``.gitignore``.
+        cache_dir: The directory to keep caches between runs in, None to disable.
+        file_paths: The paths of the files to process without any directory
+            discovery.
+        backend: The :class: `ParserBackend` to parse the test files with.
+        max_workers: The number of worker processes of the ``process`` backend.
+
+    All roots and listed files go through a single collection, parse and
+    event loop run, each distinct test file is parsed once.
+
+    """
+
+    root_path: str | Sequence[str] | None = None
+    exclude: Sequence[str] = ()
+    use_gitignore: bool = False
+    cache_dir: str | None = None
+    file_paths: Sequence[Path] = ()
+    backend: ParserBackend = ParserBackend.ASYNC
+    max_workers: int = DEFAULT_MAX_WORKERS
+    test_file_collector: FileCollector | MultiFileCollector | None = field(
+        init=False,
+        default=None,
+    )
     async_ast_parser: AsyncASTParser = field(init=False)
 
     def __post_init__(self):
         """Initialize a ParallelProcess object.
 
         This method collects all MHS test files and parses them in parallel.
+        The collector streams the test files into the parser, so parsing starts
+        while the directory tree is still being walked. Explicit file paths are
+        passed to the parser directly, without a collector.
         """
+        if self.root_path is None:
+            test_files = [path for path in self.file_paths if self.is_test_file(path)]
+            logger.debug(f"Processing {len(test_files)} listed test files")
+            self.async_ast_parser = AsyncASTParser(
+                test_files,
+                backend=self.backend,
+                max_workers=self.max_workers,
+                cache_dir=self.cache_dir,
+            )
+            return
+        snapshot_path = (
+            Path(self.cache_dir) / SNAPSHOT_FILE_NAME if self.cache_dir else None
+        )
         # producer
-        self.test_file_collector = FileCollector(self.root_path)
+        if isinstance(self.root_path, str):
+            self.test_file_collector = FileCollector(
+                self.root_path,
+                exclude=self.exclude,
+                use_gitignore=self.use_gitignore,
+                snapshot_path=snapshot_path,
+                stream=True,
+            )
+        else:
+            self.test_file_collector = MultiFileCollector(
+                self.root_path,
+                file_paths=self.file_paths,
+                exclude=self.exclude,
+                use_gitignore=self.use_gitignore,
+                snapshot_path=snapshot_path,
+                stream=True,
+            )
         # consumer and producer
-        self.async_ast_parser = AsyncASTParser(self.test_file_collector.test_files)
+        self.async_ast_parser = AsyncASTParser(
+            self.test_file_collector,
+            backend=self.backend,
+            max_workers=self.max_workers,
+            cache_dir=self.cache_dir,
+        )
+
+    @staticmethod
+    def is_test_file(file_path: Path) -> bool:
+        """Check if a listed file is a test file, logging the ones skipped.
+
+        Args:
+            file_path: The path of the listed file.
+
+        Returns:
+            True if the file is a test file, False otherwise.
+
+        """
+        if FileCollector.is_test_file(file_path):
+            return True
+        logger.debug(f"Skipping listed path that is not a test file: {file_path}")
+        return False
 
     def __len__(self):
         """Return the total number of test classes in all test modules."""
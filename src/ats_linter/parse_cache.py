@@ -0,0 +1,222 @@
+"""Copyright (c) 2023 Aydin Abdi.
+
+This module defines a persistent cache of extracted test modules.
+
+Every entry holds the :class: `TestModule` extracted from a file, keyed by the
+hash of the file content, the linter version and the Python version. A file
+whose content did not change is never parsed again, whatever its path or
+mtime. Entries are evicted least recently used first once the cache grows
+beyond its size cap. With a :class: `StatIndex` the content key of a file
+whose stat did not change is taken from the index, without reading the file.
+
+Example:
+    cache = ParseCache(Path('.ats_linter_cache/parse_cache'))
+    key = cache.key(Path('tests/test_example.py').read_bytes())
+    test_module = cache.get(key, 'test_example')
+    cache.prune()
+
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from loguru import logger
+
+from ats_linter import __version__
+from ats_linter.data_classes import TestModule
+from ats_linter.stat_index import StatIndex
+
+# Comment out to enable logging
+logger.disable(__name__)
+
+PARSE_CACHE_DIR_NAME = "parse_cache"
+PARSE_CACHE_SUFFIX = ".pickle"
+DEFAULT_MAX_CACHE_SIZE = 256 * 1024 * 1024
+
+
+@dataclass
+class ParseCache:
+    """Keep the test modules extracted from file contents on disk between runs.
+
+    Entries are stored one file each, sharded by the first two characters of
+    their key, and written atomically, so concurrent threads and processes
+    can share one cache. Reading an entry refreshes its mtime, which
+    :meth: `prune` uses as the last use time.
+
+    Parameters
+    ----------
+        cache_dir: The directory of the cache entries.
+        max_size: The total size in bytes the cache is pruned down to.
+        stat_index: The index of content keys by file stat, None to hash
+            every file.
+        nbr_of_hits: The number of test modules read from the cache.
+        nbr_of_misses: The number of test modules not found in the cache.
+
+    """
+
+    cache_dir: Path
+    max_size: int = DEFAULT_MAX_CACHE_SIZE
+    stat_index: StatIndex | None = None
+    nbr_of_hits: int = field(init=False, default=0)
+    nbr_of_misses: int = field(init=False, default=0)
+    _salt: bytes = field(init=False, repr=False)
+
+    def __post_init__(self):
+        """Derive the key salt from the linter and Python versions."""
+        self.cache_dir = Path(self.cache_dir)
+        self._salt = f"{__version__}\0{sys.version}\0".encode()
+
+    def key(self, content: bytes) -> str:
+        """Return the cache key of a file content.
+
+        Args:
+            content: The raw content of the file.
+
+        Returns:
+            The hex digest identifying the content for this linter and Python.
+
+        """
+        return hashlib.sha256(self._salt + content).hexdigest()
+
+    def lookup(self, file_path: Path) -> TestModule | None:
+        """Return the cached test module of a file from its stat alone.
+
+        Args:
+            file_path: The path of the file.
+
+        Returns:
+            The cached :class: `TestModule`, or None if the stat of the file
+            changed or its entry is not cached. The file is never read.
+
+        """
+        if self.stat_index is None:
+            return None
+        key = self.stat_index.get(str(file_path.absolute()), file_path.stat())
+        if key is None or not self._entry_path(key).exists():
+            return None
+        return self.get(key, file_path.stem)
+
+    def load(self, file_path: Path) -> tuple[TestModule | bytes, str]:
+        """Return the cached test module of a file, or its content to parse.
+
+        The file is only read and hashed if the stat index has no key for it.
+
+        Args:
+            file_path: The path of the file.
+
+        Returns:
+            A tuple of the cached :class: `TestModule` or the content of the
+            file, and the cache key of its content.
+
+        """
+        if self.stat_index is None:
+            content = file_path.read_bytes()
+            key = self.key(content)
+        else:
+            absolute_path = str(file_path.absolute())
+            stat = file_path.stat()
+            key = self.stat_index.get(absolute_path, stat)
+            if key is not None:
+                test_module = self.get(key, file_path.stem)
+                if test_module is None:
+                    return file_path.read_bytes(), key
+                return test_module, key
+            content = file_path.read_bytes()
+            key = self.key(content)
+            self.stat_index.put(absolute_path, stat, key)
+        test_module = self.get(key, file_path.stem)
+        return (content if test_module is None else test_module), key
+
+    def get(self, key: str, module_name: str) -> TestModule | None:
+        """Return the cached test module of a key.
+
+        Args:
+            key: The cache key of the file content.
+            module_name: The name of the module the content was read from.
+
+        Returns:
+            The cached :class: `TestModule` named after ``module_name``, or
+            None if the key is not cached or its entry cannot be read.
+
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with entry_path.open("rb") as entry:
+                test_module = pickle.load(entry)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            self.nbr_of_misses += 1
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.debug(f"Dropping unreadable cache entry {entry_path}: {e}")
+            entry_path.unlink(missing_ok=True)
+            self.nbr_of_misses += 1
+            return None
+        self.nbr_of_hits += 1
+        if test_module.name != module_name:
+            test_module = replace(test_module, name=module_name)
+        return test_module
+
+    def put(self, key: str, test_module: TestModule) -> None:
+        """Store the test module extracted from a file content.
+
+        Args:
+            key: The cache key of the file content.
+            test_module: The test module extracted from the content.
+
+        """
+        entry_path = self._entry_path(key)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            descriptor, temporary_path = tempfile.mkstemp(
+                dir=entry_path.parent,
+                suffix=".tmp",
+            )
+            with os.fdopen(descriptor, "wb") as entry:
+                pickle.dump(test_module, entry, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, entry_path)
+        except OSError as e:
+            logger.error(f"Could not write cache entry {entry_path}: {e}")
+
+    def prune(self) -> int:
+        """Evict the least recently used entries until the cache fits its size cap.
+
+        Returns:
+            The number of entries evicted.
+
+        """
+        entries = []
+        total_size = 0
+        for entry_path in self.cache_dir.glob(f"*/*{PARSE_CACHE_SUFFIX}"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry_path))
+            total_size += stat.st_size
+        nbr_of_evicted = 0
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_size -= size
+            nbr_of_evicted += 1
+        logger.debug(f"Evicted {nbr_of_evicted} parse cache entries")
+        return nbr_of_evicted
+
+    def _entry_path(self, key: str) -> Path:
+        """Return the path of the entry of a key.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The path of the entry file.
+
+        """
+        return self.cache_dir / key[:2] / f"{key}{PARSE_CACHE_SUFFIX}"
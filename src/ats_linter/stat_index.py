@@ -0,0 +1,122 @@
+"""Copyright (c) 2023 Aydin Abdi.
+
+This module defines a persistent index of file metadata to content keys.
+
+Like the index of git, every entry records the mtime, size and inode a file
+had when its content was hashed. As long as all three are unchanged the file
+is taken to have the same content, so the content key costs one ``stat``
+instead of reading and hashing the whole file. Files modified shortly before
+they were hashed are not recorded, since a later write within the timestamp
+granularity of the filesystem would not change their mtime.
+
+Example:
+    index = StatIndex(Path('.ats_linter_cache/stat_index.json'))
+    key = index.get('/path/to/test_example.py', os.stat('/path/to/test_example.py'))
+    index.save()
+
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+# Comment out to enable logging
+logger.disable(__name__)
+
+STAT_INDEX_FILE_NAME = "stat_index.json"
+STAT_INDEX_FORMAT_VERSION = 1
+# Coarsest mtime granularity of common filesystems, FAT has two seconds.
+RACY_WINDOW_NS = 2 * 10**9
+
+
+@dataclass
+class StatIndex:
+    """Map file paths to the content keys they had at a recorded stat.
+
+    Parameters
+    ----------
+        index_path: The path of the index file, None for an index that only
+            lives in memory.
+        entries: The index entries by absolute file path.
+        nbr_of_hits: The number of keys taken from the index.
+        nbr_of_misses: The number of files that had to be hashed again.
+
+    """
+
+    index_path: Path | None = None
+    entries: dict[str, list] = field(init=False, default_factory=dict)
+    nbr_of_hits: int = field(init=False, default=0)
+    nbr_of_misses: int = field(init=False, default=0)
+    _racy_after_ns: int = field(init=False, repr=False)
+
+    def __post_init__(self):
+        """Load the index file, starting empty if it is missing or invalid."""
+        self._racy_after_ns = time.time_ns() - RACY_WINDOW_NS
+        if self.index_path is None:
+            return
+        try:
+            content = json.loads(Path(self.index_path).read_text())
+        except (OSError, ValueError) as e:
+            logger.debug(f"No usable stat index at {self.index_path}: {e}")
+            return
+        if content.get("version") == STAT_INDEX_FORMAT_VERSION:
+            self.entries = content.get("files", {})
+
+    def get(self, file_path: str, stat: os.stat_result) -> str | None:
+        """Return the recorded content key of a file if its stat is unchanged.
+
+        Args:
+            file_path: The absolute path of the file.
+            stat: The current stat result of the file.
+
+        Returns:
+            The recorded content key, or None if the file was not recorded or
+            has changed since.
+
+        """
+        entry = self.entries.get(file_path)
+        if (
+            entry
+            and entry[0] == stat.st_mtime_ns
+            and entry[1] == stat.st_size
+            and entry[2] == stat.st_ino
+        ):
+            self.nbr_of_hits += 1
+            return entry[3]
+        self.nbr_of_misses += 1
+        return None
+
+    def put(self, file_path: str, stat: os.stat_result, key: str) -> None:
+        """Record the content key of a file.
+
+        Args:
+            file_path: The absolute path of the file.
+            stat: The stat result of the file taken before it was read.
+            key: The content key of the file.
+
+        """
+        if stat.st_mtime_ns >= self._racy_after_ns:
+            self.entries.pop(file_path, None)
+            return
+        self.entries[file_path] = [stat.st_mtime_ns, stat.st_size, stat.st_ino, key]
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        if self.index_path is None:
+            return
+        index_path = Path(self.index_path)
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+            temporary_path.write_text(
+                json.dumps(
+                    {"version": STAT_INDEX_FORMAT_VERSION, "files": self.entries},
+                ),
+            )
+            os.replace(temporary_path, index_path)
+        except OSError as e:
+            logger.error(f"Could not save stat index {index_path}: {e}")
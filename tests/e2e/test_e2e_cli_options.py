@@ -7,6 +7,7 @@ produces the expected side-effect on output, exit code, and verbosity.
 Adding a new flag?  Add it to the CLI, then add a focused test class here.
 """
 
+from ats_linter.cli import app
 from tests.e2e.conftest import make_test_module
 
 
@@ -153,3 +154,83 @@ class TestExplicitFilePath:
         result = run_linter(str(test_file))
 
         assert result.exit_code == 1
+
+
+class TestExcludeOption:
+    """The --exclude flag prunes matching paths from directory collection."""
+
+    def test_excluded_directory_is_not_linted(
+        self, tmp_path, run_linter, ats_minimal_docstring
+    ):
+        """Objective:
+            Verify that a directory matched by --exclude is skipped during
+            collection, so non-compliant files inside it do not fail the run.
+
+        Approvals:
+            - The linter exits with code 1 without --exclude
+            - The linter exits with code 0 with --exclude
+
+        Test steps:
+            1. Write a compliant test file in the root directory
+            2. Write a non-compliant test file in a generated subdirectory
+            3. Invoke ats-linter against the root directory
+            4. Verify that the exit code is 1
+            5. Invoke ats-linter again with --exclude for the subdirectory
+            6. Verify that the exit code is 0
+        """
+        (tmp_path / "test_good.py").write_text(
+            make_test_module([("test_good", ats_minimal_docstring)])
+        )
+        generated = tmp_path / "tests_generated"
+        generated.mkdir()
+        (generated / "test_bad.py").write_text(
+            make_test_module([("test_no_docstring", None)])
+        )
+
+        result_all = run_linter(str(tmp_path))
+        result_excluded = run_linter(
+            str(tmp_path), extra_args=["--exclude", "tests_generated"]
+        )
+
+        assert result_all.exit_code == 1
+        assert result_excluded.exit_code == 0
+
+
+class TestFilesFromOption:
+    """The --files-from flag lints an explicit list of files without discovery."""
+
+    def test_files_listed_on_stdin_are_linted(
+        self, cli_runner, write_test_file, ats_minimal_docstring
+    ):
+        """Objective:
+            Verify that test files listed on stdin with --files-from - are all
+            linted in one run, as done by hooks that already know the staged
+            files.
+
+        Approvals:
+            - The linter exits with code 0 when every listed file is compliant
+            - The linter exits with code 1 when a listed file is non-compliant
+
+        Test steps:
+            1. Write a compliant and a non-compliant test file
+            2. Invoke ats-linter with --files-from - listing the compliant file
+            3. Verify that the exit code is 0
+            4. Invoke ats-linter with --files-from - listing both files
+            5. Verify that the exit code is 1
+        """
+        good = write_test_file(
+            "test_listed_good.py",
+            make_test_module([("test_listed_good", ats_minimal_docstring)]),
+        )
+        bad = write_test_file(
+            "test_listed_bad.py",
+            make_test_module([("test_listed_bad", None)]),
+        )
+
+        result_good = cli_runner.invoke(app, ["--files-from", "-"], input=f"{good}\n")
+        result_both = cli_runner.invoke(
+            app, ["--files-from", "-"], input=f"{good}\0{bad}\0"
+        )
+
+        assert result_good.exit_code == 0
+        assert result_both.exit_code == 1
@@ -1,5 +1,7 @@
 import ast
 
+import pytest
+
 from ats_linter.ast_test_module_factory import ASTTestModuleFactory
 from ats_linter.data_classes import PytestFixture, TestCase, TestClass
 
@@ -96,3 +98,19 @@ def my_fixture(): """doc"""; pass
     assert test_cases[0].name == "test_foo"
     assert len(fixtures) == 1
     assert fixtures[0].name == "my_fixture"
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        (b"def test_foo(): pass\n", True),
+        (b"    def Test_upper(self): pass\n", True),
+        (b"class TestFoo:\n    pass\n", True),
+        (b"def helper(): pass\nclass Helper: pass\n", False),
+        (b"class testlower: pass\n", False),
+        (b"undef test_x = 1\n", False),
+        (b"", False),
+    ],
+)
+def test_has_test_definitions(content, expected):
+    assert ASTTestModuleFactory.has_test_definitions(content) is expected
@@ -1,4 +1,9 @@
 import ast
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
 
 import pytest
 
@@ -7,18 +12,29 @@ from ats_linter.async_ast_parser import (
     ASTConsumer,
     ASTProducer,
     AsyncASTParser,
+    ParserBackend,
+    parse_files_chunk,
 )
 from ats_linter.data_classes import TestModule
+from ats_linter.file_collector import FileCollector
 
 
 def test_astproducer_get_ast_tree(tmp_path):
     file = tmp_path / "test_file.py"
-    file.write_text("def foo(): pass\n")
+    file.write_text("def test_foo(): pass\n")
     ast_tree = ASTProducer._get_ast_tree(file)
     assert isinstance(ast_tree, ast.Module)
     assert any(isinstance(n, ast.FunctionDef) for n in ast_tree.body)
 
 
+def test_astproducer_get_ast_tree_skips_files_without_tests(mocker, tmp_path):
+    file = tmp_path / "test_helpers.py"
+    file.write_text("import os\n\n\ndef make_test_data(): pass\n")
+    parse_spy = mocker.spy(ast, "parse")
+    assert ASTProducer._get_ast_tree(file) is None
+    assert parse_spy.call_count == 0
+
+
 def test_astproducer_is_test_file(tmp_path):
     test_file = tmp_path / "test_foo.py"
     non_test_file = tmp_path / "foo.py"
@@ -66,3 +82,202 @@ def test_bar(): pass
     parser = await AsyncASTParser.from_files([test_file])
     assert len(parser.test_modules) == 1
     assert parser.test_modules[0].name == "test_integration"
+
+
+@pytest.mark.asyncio
+async def test_async_ast_parser_streams_from_collector(tmp_path):
+    test_dir = tmp_path / "tests"
+    test_dir.mkdir()
+    for name in ("test_one", "test_two"):
+        (test_dir / f"{name}.py").write_text(f"def {name}(): pass\n")
+    collector = FileCollector(str(test_dir), stream=True)
+    parser = await AsyncASTParser.from_files(collector)
+    assert sorted(m.name for m in parser.test_modules) == ["test_one", "test_two"]
+    assert len(collector.test_files) == 2
+
+
+@pytest.mark.asyncio
+async def test_astproducer_reads_concurrently_within_limit(monkeypatch, tmp_path):
+    files = []
+    for index in range(8):
+        file = tmp_path / f"test_{index}.py"
+        file.write_text(f"def test_{index}(): pass\n")
+        files.append(file)
+    in_flight = []
+    peak = []
+    threads = set()
+    lock = threading.Lock()
+    get_ast_tree = ASTProducer._get_ast_tree
+
+    def slow_get_ast_tree(file_path):
+        with lock:
+            in_flight.append(file_path)
+            peak.append(len(in_flight))
+            threads.add(threading.current_thread().name)
+        time.sleep(0.02)
+        with lock:
+            in_flight.remove(file_path)
+        return get_ast_tree(file_path)
+
+    monkeypatch.setattr(ASTProducer, "_get_ast_tree", staticmethod(slow_get_ast_tree))
+    producer = ASTProducer(files, max_concurrency=3)
+    await producer.produce_ast_trees()
+
+    assert producer.ast_tree_queue.qsize() == len(files)
+    assert 1 < max(peak) <= 3
+    assert all(name.startswith("ats-linter-reader") for name in threads)
+
+
+@pytest.mark.asyncio
+async def test_astproducer_raises_first_error(tmp_path):
+    bad_file = tmp_path / "test_bad.py"
+    bad_file.write_text("def test_bad(:\n")
+    producer = ASTProducer([bad_file])
+    with pytest.raises(SyntaxError):
+        await producer.produce_ast_trees()
+
+
+def test_parse_files_chunk_returns_test_modules(tmp_path):
+    files = []
+    for name in ("test_one", "test_two"):
+        file = tmp_path / f"{name}.py"
+        file.write_text(f"class TestX:\n    def {name}(self): pass\n")
+        files.append(file)
+    test_modules, _, _ = parse_files_chunk(files)
+    assert [m.name for m in test_modules] == ["test_one", "test_two"]
+    assert all(isinstance(m, TestModule) for m in test_modules)
+    assert test_modules[0].test_classes[0].test_cases[0].name == "test_one"
+
+
+@pytest.mark.asyncio
+async def test_process_backend_matches_async_backend(tmp_path):
+    files = []
+    for index in range(7):
+        file = tmp_path / f"test_{index}.py"
+        file.write_text(f'def test_{index}():\n    """Doc {index}."""\n')
+        files.append(file)
+    expected = await AsyncASTParser.from_files(files)
+    parser = await AsyncASTParser.from_files(
+        iter(files),
+        backend=ParserBackend.PROCESS,
+        max_workers=2,
+        chunk_size=3,
+    )
+    key = lambda m: m.name  # noqa: E731
+    assert sorted(parser.test_modules, key=key) == sorted(
+        expected.test_modules,
+        key=key,
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_backend_raises_worker_error(tmp_path):
+    bad_file = tmp_path / "test_bad.py"
+    bad_file.write_text("def test_bad(:\n")
+    with pytest.raises(SyntaxError):
+        await AsyncASTParser.from_files(
+            [bad_file],
+            backend=ParserBackend.PROCESS,
+            max_workers=1,
+        )
+
+
+@pytest.mark.asyncio
+async def test_producer_waits_for_slow_consumer(monkeypatch, tmp_path):
+    files = []
+    for index in range(20):
+        file = tmp_path / f"test_{index}.py"
+        file.write_text(f"def test_{index}(): pass\n")
+        files.append(file)
+    peak = []
+    parse_ast_tree = ASTConsumer.parse_ast_tree
+
+    def slow_parse_ast_tree(self, module_name, ast_tree):
+        peak.append(self.ast_tree_queue.qsize())
+        time.sleep(0.002)
+        return parse_ast_tree(self, module_name, ast_tree)
+
+    monkeypatch.setattr(ASTConsumer, "parse_ast_tree", slow_parse_ast_tree)
+    parser = await AsyncASTParser.from_files(files, max_concurrency=2, max_queue_size=3)
+    assert len(parser.test_modules) == len(files)
+    assert max(peak) <= 3
+
+
+@pytest.mark.asyncio
+async def test_producer_exit_does_not_block_on_full_queue(tmp_path):
+    file = tmp_path / "test_full.py"
+    file.write_text("def test_full(): pass\n")
+    producer = ASTProducer([file], ast_tree_queue=asyncio.Queue(maxsize=1))
+
+    async def produce_without_consumer():
+        async with producer:
+            await producer.task
+
+    await asyncio.wait_for(produce_without_consumer(), timeout=1)
+    assert producer.ast_tree_queue.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_run_skips_ast_parse(mocker, tmp_path):
+    files = []
+    for index in range(3):
+        file = tmp_path / f"test_{index}.py"
+        file.write_text(f'def test_{index}():\n    """Doc {index}."""\n')
+        files.append(file)
+    cache_dir = tmp_path / "cache"
+    cold = await AsyncASTParser.from_files(files, cache_dir=cache_dir)
+    assert cold.stats.nbr_of_cache_misses == 3
+
+    parse_spy = mocker.spy(ast, "parse")
+    warm = await AsyncASTParser.from_files(files, cache_dir=cache_dir)
+    assert parse_spy.call_count == 0
+    assert warm.stats.nbr_of_cache_hits == 3
+    key = lambda m: m.name  # noqa: E731
+    assert sorted(warm.test_modules, key=key) == sorted(cold.test_modules, key=key)
+
+    process = await AsyncASTParser.from_files(
+        files,
+        backend=ParserBackend.PROCESS,
+        max_workers=1,
+        cache_dir=cache_dir,
+    )
+    assert process.stats.nbr_of_cache_hits == 3
+
+
+@pytest.mark.asyncio
+async def test_warm_run_on_unchanged_files_only_stats(mocker, tmp_path):
+    files = []
+    for index in range(3):
+        file = tmp_path / f"test_{index}.py"
+        file.write_text(f"def test_{index}(): pass\n")
+        old = file.stat().st_mtime_ns - 10**10
+        os.utime(file, ns=(old, old))
+        files.append(file)
+    cache_dir = tmp_path / "cache"
+    await AsyncASTParser.from_files(files, cache_dir=cache_dir)
+
+    read_spy = mocker.spy(Path, "read_bytes")
+    warm = await AsyncASTParser.from_files(files, cache_dir=cache_dir)
+    process = await AsyncASTParser.from_files(
+        files,
+        backend=ParserBackend.PROCESS,
+        cache_dir=cache_dir,
+    )
+    assert read_spy.call_count == 0
+    assert warm.stats.nbr_of_cache_hits == process.stats.nbr_of_cache_hits == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", list(ParserBackend))
+async def test_files_without_tests_are_counted_as_skipped(backend, tmp_path):
+    helper = tmp_path / "test_utils.py"
+    helper.write_text("def helper(): pass\n")
+    test = tmp_path / "test_real.py"
+    test.write_text("class TestReal:\n    def test_real(self): pass\n")
+    parser = await AsyncASTParser.from_files(
+        [helper, test],
+        backend=backend,
+        max_workers=1,
+    )
+    assert [m.name for m in parser.test_modules] == ["test_real"]
+    assert parser.stats.nbr_of_skipped_files == 1
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import pytest
 import typer
 
@@ -76,3 +78,40 @@ def test_main_linting_fails(mocker):
     with pytest.raises(typer.Exit) as exc_info:
         cli.main()
     assert exc_info.value.exit_code == 1  # Linting failure results in exit code 1
+
+
+def test_main_files_from_uses_one_processor(mocker, tmp_path):
+    path_list = tmp_path / "paths.txt"
+    path_list.write_text("tests/test_a.py\ntests/test_b.py\n")
+    mock_file_processor = mocker.patch("ats_linter.cli.FileProcessorCocurrent")
+    mock_module = mocker.Mock()
+    mock_module.test_classes = []
+    mock_module.test_cases = ["case1"]
+    mock_file_processor.return_value.__iter__.return_value = [mock_module]
+    mock_factory = mocker.patch("ats_linter.cli.ATSTestCasesFactory")
+    mock_factory.return_value.ats_test_cases = ["ats_case1"]
+    mock_linter = mocker.patch("ats_linter.cli.ATSTestCasesLinter")
+    mock_linter.return_value.lint.return_value = True
+
+    with pytest.raises(typer.Exit) as exc_info:
+        cli.main(files_from=str(path_list))
+
+    assert exc_info.value.exit_code == 0
+    mock_file_processor.assert_called_once()
+    args, kwargs = mock_file_processor.call_args
+    assert args == (None,)
+    assert kwargs["file_paths"] == [Path("tests/test_a.py"), Path("tests/test_b.py")]
+
+
+def test_main_builds_one_processor_for_all_paths(mocker):
+    mock_file_processor = mocker.patch("ats_linter.cli.FileProcessorCocurrent")
+    mock_file_processor.return_value.__iter__.return_value = []
+
+    with pytest.raises(typer.Exit) as exc_info:
+        cli.main(files=["tests/", "tests/unit/", "other/test_x.py"])
+
+    assert exc_info.value.exit_code == 0
+    mock_file_processor.assert_called_once()
+    assert mock_file_processor.call_args.args == (
+        ["tests/", "tests/unit/", "other/test_x.py"],
+    )
@@ -1,3 +1,5 @@
+import pickle
+
 from ats_linter.data_classes import TestCase, TestClass, TestModule
 
 
@@ -33,3 +35,15 @@ def test_testmodule_len_and_dict():
     assert d["test_module"] == "mod1"
     assert d["test_classes"][0]["name"] == "A"
     assert d["test_cases"][0]["name"] == "t2"
+
+
+def test_testmodule_pickle_round_trip():
+    tc1 = TestCase(name="t1", docstring="doc1", code="code1")
+    test_class = TestClass(name="A", docstring="docA", test_cases=[tc1], fixtures=[])
+    mod = TestModule(
+        name="mod1",
+        test_classes=[test_class],
+        test_cases=[],
+        fixtures=[],
+    )
+    assert pickle.loads(pickle.dumps(mod)) == mod
@@ -0,0 +1,59 @@
+import os
+from pathlib import Path
+
+from ats_linter.data_classes import DirectoryListing
+from ats_linter.directory_snapshot import SNAPSHOT_FILE_NAME, DirectorySnapshot
+from ats_linter.file_collector import DirectoryWalker, FileCollector
+
+
+def test_snapshot_round_trip(tmp_path: Path):
+    snapshot_path = tmp_path / "cache" / SNAPSHOT_FILE_NAME
+    directory = tmp_path / "tests"
+    directory.mkdir()
+    stat = os.stat(directory)
+    listing = DirectoryListing(("unit",), ("test_a.py",), True)
+
+    snapshot = DirectorySnapshot(snapshot_path)
+    assert snapshot.get(str(directory), stat) is None
+    snapshot.put(str(directory), stat, listing)
+    snapshot.save()
+
+    reloaded = DirectorySnapshot(snapshot_path)
+    assert reloaded.get(str(directory), stat) == listing
+    assert reloaded.nbr_of_hits == 1
+
+    (directory / "test_b.py").touch()
+    assert reloaded.get(str(directory), os.stat(directory)) is None
+
+
+def test_snapshot_ignores_invalid_file(tmp_path: Path):
+    snapshot_path = tmp_path / SNAPSHOT_FILE_NAME
+    snapshot_path.write_text("{not json")
+    assert DirectorySnapshot(snapshot_path).entries == {}
+
+
+def test_snapshot_drops_unvisited_directories_below_roots(tmp_path: Path):
+    snapshot_path = tmp_path / SNAPSHOT_FILE_NAME
+    snapshot = DirectorySnapshot(snapshot_path)
+    snapshot.entries = {"/root/gone": [0, 0, [], [], False], "/other": [0, 0, [], []]}
+    snapshot.add_root("/root")
+    snapshot.save()
+    assert set(DirectorySnapshot(snapshot_path).entries) == {"/other"}
+
+
+def test_walker_reuses_unchanged_directories(tmp_path: Path):
+    root = tmp_path / "tests"
+    for directory in ("tests_a", "tests_b", "tests_c"):
+        (root / directory).mkdir(parents=True)
+        (root / directory / f"test_{directory}.py").touch()
+    snapshot_path = tmp_path / SNAPSHOT_FILE_NAME
+
+    cold = FileCollector(str(root), snapshot_path=snapshot_path)
+    (root / "tests_b" / "test_new.py").touch()
+    snapshot = DirectorySnapshot(snapshot_path)
+    walker = DirectoryWalker(root, snapshot=snapshot)
+    warm = [file for _, files in walker.walk() for file in files]
+
+    assert walker.nbr_of_listings == 1
+    assert snapshot.nbr_of_hits == 3
+    assert sorted(warm) == sorted([*cold.test_files, root / "tests_b" / "test_new.py"])
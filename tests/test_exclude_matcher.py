@@ -0,0 +1,79 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from ats_linter.exclude_matcher import ExcludeMatcher, glob_to_regex
+from ats_linter.file_collector import DirectoryWalker, FileCollector
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path", "expected"),
+    [
+        ("*.egg-info", "pkg.egg-info", True),
+        ("*.py", "a/b.py", False),
+        ("**/fixtures", "a/b/fixtures", True),
+        ("**/fixtures", "fixtures", True),
+        ("data/**", "data/a/b", True),
+        ("test_?.py", "test_1.py", True),
+        ("test_[!0-9].py", "test_1.py", False),
+    ],
+)
+def test_glob_to_regex(pattern, path, expected):
+    assert bool(re.fullmatch(glob_to_regex(pattern), path)) is expected
+
+
+def test_default_excludes(tmp_path: Path):
+    matcher = ExcludeMatcher(tmp_path)
+    assert matcher.is_excluded(".git", is_dir=True)
+    assert matcher.is_excluded("sub/node_modules", is_dir=True)
+    assert matcher.is_excluded("pkg.egg-info", is_dir=True)
+    assert not matcher.is_excluded("tests", is_dir=True)
+    assert not ExcludeMatcher(tmp_path, use_default_excludes=False).is_excluded(
+        ".git",
+        is_dir=True,
+    )
+
+
+def test_user_patterns(tmp_path: Path):
+    matcher = ExcludeMatcher(tmp_path, ["tests/generated", "test_slow_*.py"])
+    assert matcher.is_excluded("tests/generated", is_dir=True)
+    assert not matcher.is_excluded("other/tests/generated", is_dir=True)
+    assert matcher.is_excluded("tests/unit/test_slow_io.py", is_dir=False)
+    assert not matcher.is_excluded("tests/unit/test_fast.py", is_dir=False)
+
+
+def test_gitignore_rules(tmp_path: Path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text(
+        "# comment\nout/\n/tests/tmp\ntest_gen_*.py\n!test_gen_keep.py\n",
+    )
+    root = tmp_path / "tests"
+    root.mkdir()
+    (root / ".gitignore").write_text("local\n")
+    matcher = ExcludeMatcher(root, use_gitignore=True)
+    assert matcher.is_excluded("out", is_dir=True)
+    assert not matcher.is_excluded("out", is_dir=False)
+    assert matcher.is_excluded("tmp", is_dir=True)
+    assert not matcher.is_excluded("unit/tmp", is_dir=True)
+    assert matcher.is_excluded("unit/test_gen_a.py", is_dir=False)
+    assert not matcher.is_excluded("unit/test_gen_keep.py", is_dir=False)
+    assert matcher.is_excluded("local", is_dir=True)
+    assert not ExcludeMatcher(root).is_excluded("out", is_dir=True)
+
+
+def test_walker_never_lists_excluded_directories(mocker, tmp_path: Path):
+    root = tmp_path / "tests"
+    for directory in (".git/objects", ".venv/lib", "node_modules/pkg", "tests_unit"):
+        (root / directory).mkdir(parents=True)
+    (root / "tests_unit" / "test_unit.py").touch()
+    (root / "node_modules" / "pkg" / "test_pkg.py").touch()
+    listing_spy = mocker.spy(DirectoryWalker, "list_directory")
+
+    collector = FileCollector(str(root), exclude=["tests_unit"])
+    assert collector.test_files == []
+    listed = {call.args[1].name for call in listing_spy.call_args_list}
+    assert listed == {"tests"}
+
+    collector = FileCollector(str(root))
+    assert collector.test_files == [root / "tests_unit" / "test_unit.py"]
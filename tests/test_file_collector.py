@@ -1,6 +1,16 @@
+import io
+import os
 from pathlib import Path
 
-from ats_linter.file_collector import PYTHON_FILE_EXTENSION, FileCollector
+import pytest
+
+from ats_linter.file_collector import (
+    PYTHON_FILE_EXTENSION,
+    DirectoryWalker,
+    FileCollector,
+    MultiFileCollector,
+    read_path_list,
+)
 
 
 def test_post_init(file_collector: FileCollector, tmp_path) -> None:
@@ -107,6 +117,67 @@ def test_collect_test_directories_and_files_in_parallel(
     assert len(file_collector.test_directories) == expected_test_directories
 
 
+def test_walker_matches_glob_collection(mock_files: Path) -> None:
+    """Test that the scandir walker collects the same result as the glob one."""
+    nested_dir = mock_files / "test_dir1" / "tests"
+    nested_dir.mkdir()
+    (nested_dir / "test_nested.py").touch()
+    (mock_files / "test_dir2" / "helper.py").touch()
+
+    walked = FileCollector(str(mock_files))
+    globbed = FileCollector(str(mock_files))
+    globbed.test_directories.clear()
+    globbed.test_files.clear()
+    globbed.collect_test_directories_and_files_in_parallel()
+
+    assert sorted(walked.test_directories) == sorted(globbed.test_directories)
+    assert sorted(walked.test_files) == sorted(globbed.test_files)
+
+
+def test_walker_lists_each_directory_once(mocker, mock_files: Path) -> None:
+    """Test that the walker reads every directory with exactly one scandir."""
+    scandir_spy = mocker.spy(os, "scandir")
+    listdir_spy = mocker.spy(os, "listdir")
+    walker = DirectoryWalker(mock_files)
+
+    list(walker.walk())
+
+    nbr_of_directories = 4  # root, test_dir1, test_dir2 and dir3
+    assert walker.nbr_of_listings == nbr_of_directories
+    assert scandir_spy.call_count == nbr_of_directories
+    assert listdir_spy.call_count == 0
+
+
+def test_walker_skips_unreadable_directory(mocker, mock_files: Path) -> None:
+    """Test that a directory that cannot be listed is skipped."""
+    mocker.patch("ats_linter.file_collector.os.scandir", side_effect=OSError)
+    assert list(DirectoryWalker(mock_files).walk()) == []
+
+
+def test_stream_defers_collection(mock_files: Path) -> None:
+    """Test that a streaming collector walks the tree only when iterated."""
+    collector = FileCollector(str(mock_files), stream=True)
+    assert collector.test_files == []
+
+    streamed = list(collector)
+
+    assert len(streamed) == 3
+    assert collector.test_files == streamed
+    assert len(collector.test_directories) == 2
+    assert list(collector) == streamed
+
+
+@pytest.mark.asyncio
+async def test_stream_async_iteration(mock_files: Path) -> None:
+    """Test that async iteration yields the same files as a full collection."""
+    collector = FileCollector(str(mock_files), stream=True)
+
+    streamed = [path async for path in collector]
+
+    assert sorted(streamed) == sorted(FileCollector(str(mock_files)).test_files)
+    assert collector.test_files == streamed
+
+
 def test_len(file_collector: FileCollector) -> None:
     """Test that the __len__ method correctly returns the number of test files."""
     expected_length = 3
@@ -156,3 +227,46 @@ def test_root_file_path_does_not_exist() -> None:
 def test_dict_method(file_collector: FileCollector):
     """Test the __dict__ method."""
     assert isinstance(file_collector.__dict__(), dict)
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        (
+            b"tests/test_a.py\ntests/test b.py\n\n",
+            ["tests/test_a.py", "tests/test b.py"],
+        ),
+        (
+            b"tests/test_a.py\0tests/test\nb.py\0",
+            ["tests/test_a.py", "tests/test\nb.py"],
+        ),
+    ],
+)
+def test_read_path_list(tmp_path: Path, content: bytes, expected: list[str]) -> None:
+    """Test that newline and NUL separated path lists are read."""
+    path_list = tmp_path / "paths.txt"
+    path_list.write_bytes(content)
+    assert read_path_list(str(path_list)) == [Path(path) for path in expected]
+
+
+def test_read_path_list_from_stdin(monkeypatch) -> None:
+    """Test that '-' reads the path list from standard input."""
+    monkeypatch.setattr(
+        "sys.stdin",
+        type("Stdin", (), {"buffer": io.BytesIO(b"test_a.py\ntest_b.py\n")})(),
+    )
+    assert read_path_list("-") == [Path("test_a.py"), Path("test_b.py")]
+
+
+def test_multi_file_collector_deduplicates(mock_files: Path) -> None:
+    """Test that overlapping roots and listed files yield each file once."""
+    test_dir = mock_files / "test_dir1"
+    collector = MultiFileCollector(
+        [str(mock_files), str(test_dir), str(test_dir / "..")],
+        file_paths=[test_dir / "test_file1.py", mock_files / "dir3" / "file4.py"],
+    )
+
+    assert len(collector.file_collectors) == 2
+    assert sorted(collector.test_files) == sorted(
+        FileCollector(str(mock_files)).test_files,
+    )
@@ -9,7 +9,7 @@ class DummyTestModule:
 
 
 class DummyAsyncASTParser:
-    def __init__(self, test_files):
+    def __init__(self, test_files, **kwargs):
         self.test_modules = [DummyTestModule([1, 2])]
 
     def __len__(self):
@@ -17,7 +17,7 @@ class DummyAsyncASTParser:
 
 
 class DummyFileCollector:
-    def __init__(self, root_path):
+    def __init__(self, root_path, **kwargs):
         self.test_files = ["dummy1.py", "dummy2.py"]
 
 
@@ -44,3 +44,28 @@ def test_file_processor_cocurrent_dict(monkeypatch, tmp_path):
     processor = FileProcessorCocurrent(str(tmp_path))
     d = processor.__dict__()
     assert isinstance(d, list)
+
+
+def test_file_processor_cocurrent_file_paths(monkeypatch, tmp_path):
+    created = []
+
+    class RecordingAsyncASTParser(DummyAsyncASTParser):
+        def __init__(self, test_files, **kwargs):
+            super().__init__(test_files)
+            created.append(list(test_files))
+
+    monkeypatch.setattr(
+        "ats_linter.parallel_process.AsyncASTParser",
+        RecordingAsyncASTParser,
+    )
+    test_file = tmp_path / "test_listed.py"
+    test_file.write_text("")
+    helper_file = tmp_path / "helper.py"
+    helper_file.write_text("")
+
+    processor = FileProcessorCocurrent(
+        file_paths=[test_file, helper_file, tmp_path / "test_missing.py"],
+    )
+
+    assert processor.test_file_collector is None
+    assert created == [[test_file]]
@@ -0,0 +1,84 @@
+import os
+from pathlib import Path
+
+from ats_linter.data_classes import TestCase, TestModule
+from ats_linter.parse_cache import PARSE_CACHE_SUFFIX, ParseCache
+from ats_linter.stat_index import RACY_WINDOW_NS, StatIndex
+
+
+def make_test_module(name: str) -> TestModule:
+    return TestModule(
+        name=name,
+        test_classes=[],
+        test_cases=[TestCase(name="test_x", docstring="Doc.", code="pass")],
+        fixtures=[],
+    )
+
+
+def test_parse_cache_round_trip(tmp_path: Path):
+    cache = ParseCache(tmp_path)
+    key = cache.key(b"def test_x(): pass\n")
+    assert cache.get(key, "test_a") is None
+    cache.put(key, make_test_module("test_a"))
+
+    reloaded = ParseCache(tmp_path)
+    assert reloaded.get(key, "test_a") == make_test_module("test_a")
+    assert reloaded.get(key, "test_b").name == "test_b"
+    assert (reloaded.nbr_of_hits, cache.nbr_of_misses) == (2, 1)
+
+
+def test_parse_cache_key_depends_on_content_and_version(mocker, tmp_path: Path):
+    cache = ParseCache(tmp_path)
+    assert cache.key(b"a") == ParseCache(tmp_path).key(b"a")
+    assert cache.key(b"a") != cache.key(b"b")
+    mocker.patch("ats_linter.parse_cache.__version__", "0.0.0-other")
+    assert ParseCache(tmp_path).key(b"a") != cache.key(b"a")
+
+
+def test_parse_cache_drops_unreadable_entry(tmp_path: Path):
+    cache = ParseCache(tmp_path)
+    key = cache.key(b"content")
+    cache.put(key, make_test_module("test_a"))
+    entry_path = next(tmp_path.glob(f"*/*{PARSE_CACHE_SUFFIX}"))
+    entry_path.write_bytes(b"not a pickle")
+    assert cache.get(key, "test_a") is None
+    assert not entry_path.exists()
+
+
+def test_parse_cache_prune_evicts_least_recently_used(tmp_path: Path):
+    cache = ParseCache(tmp_path)
+    keys = [cache.key(bytes([index])) for index in range(3)]
+    for age, key in enumerate(keys):
+        cache.put(key, make_test_module(f"test_{age}"))
+        entry_path = cache._entry_path(key)
+        os.utime(entry_path, ns=(age * 10**9, age * 10**9))
+    entry_size = cache._entry_path(keys[0]).stat().st_size
+    cache.get(keys[0], "test_0")
+
+    cache.max_size = 2 * entry_size
+    assert cache.prune() == 1
+    assert not cache._entry_path(keys[1]).exists()
+    assert cache._entry_path(keys[0]).exists()
+    assert cache._entry_path(keys[2]).exists()
+
+
+def test_parse_cache_load_reads_file_only_when_stat_changes(mocker, tmp_path: Path):
+    file_path = tmp_path / "test_a.py"
+    file_path.write_text("def test_x(): pass\n")
+    old = file_path.stat().st_mtime_ns - 2 * RACY_WINDOW_NS
+    os.utime(file_path, ns=(old, old))
+    cache = ParseCache(tmp_path / "cache", stat_index=StatIndex())
+
+    content, key = cache.load(file_path)
+    assert content == b"def test_x(): pass\n"
+    cache.put(key, make_test_module("test_a"))
+
+    read_spy = mocker.spy(Path, "read_bytes")
+    assert cache.load(file_path) == (make_test_module("test_a"), key)
+    assert cache.lookup(file_path) == make_test_module("test_a")
+    assert read_spy.call_count == 0
+
+    file_path.write_text("def test_y(): pass\n")
+    assert cache.lookup(file_path) is None
+    content, _ = cache.load(file_path)
+    assert content == b"def test_y(): pass\n"
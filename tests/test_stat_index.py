@@ -0,0 +1,44 @@
+import os
+from pathlib import Path
+
+from ats_linter.stat_index import RACY_WINDOW_NS, STAT_INDEX_FILE_NAME, StatIndex
+
+
+def write_old_file(path: Path, content: str) -> os.stat_result:
+    path.write_text(content)
+    old = path.stat().st_mtime_ns - 2 * RACY_WINDOW_NS
+    os.utime(path, ns=(old, old))
+    return path.stat()
+
+
+def test_stat_index_round_trip(tmp_path: Path):
+    index_path = tmp_path / "cache" / STAT_INDEX_FILE_NAME
+    file_path = tmp_path / "test_a.py"
+    stat = write_old_file(file_path, "def test_a(): pass\n")
+
+    index = StatIndex(index_path)
+    assert index.get(str(file_path), stat) is None
+    index.put(str(file_path), stat, "key")
+    index.save()
+
+    reloaded = StatIndex(index_path)
+    assert reloaded.get(str(file_path), stat) == "key"
+    assert (reloaded.nbr_of_hits, index.nbr_of_misses) == (1, 1)
+
+    file_path.write_text("def test_a(): assert True\n")
+    assert reloaded.get(str(file_path), file_path.stat()) is None
+
+
+def test_stat_index_skips_racily_modified_files(tmp_path: Path):
+    file_path = tmp_path / "test_a.py"
+    file_path.write_text("def test_a(): pass\n")
+    index = StatIndex()
+    index.put(str(file_path), file_path.stat(), "key")
+    assert index.entries == {}
+
+
+def test_stat_index_ignores_other_format_versions(tmp_path: Path):
+    index_path = tmp_path / STAT_INDEX_FILE_NAME
+    index_path.write_text('{"version": 0, "files": {"a": [0, 0, 0, "key"]}}')
+    assert StatIndex(index_path).entries == {}
+    StatIndex().save()